@@ -1,5 +1,14 @@
 import random
 
+from hint_service import HintService
+from packed_board import DIRECTIONS
+from puzzle_board import SolverTimeout
+from puzzle_engine import GOAL, PuzzleSession, validate_keys
+from session_log import SessionRecorder
+
+log_path = None  # Binary log the games are recorded to (see session_log); None to disable
+hint_key = "?"  # Input that asks for the best next move
+
 
 def display_intro() -> None:
     """
@@ -18,18 +27,12 @@ def get_valid_moves() -> str:
     str -> A string containing 4 unique letters representing the moves.
     """
     while True:
-        global moves
         moves = input("Enter 4 letters for left, right, up, and down moves "
-                      "(e.g., 'lrud' case insensitive): ").lower().replace(" ", "")
-
-        if not moves.isalpha():
-            print("Invalid input. Please use only alphabetical characters.")
-        elif len(moves) != 4:
-            print("Invalid input. Please enter exactly 4 letters.")
-        elif len(set(moves)) != 4:
-            print("Invalid input. Please ensure all 4 letters are unique.")
-        else:
-            return moves
+                      "(e.g., 'lrud' case insensitive): ")
+        try:
+            return validate_keys(moves)
+        except ValueError as error:
+            print(error)
 
 
 def initialize_puzzle() -> list:
@@ -57,105 +60,80 @@ def print_puzzle(puzzle: list) -> None:
     print()
 
 
-def find_empty_position(puzzle: list) -> tuple:
+def print_hint(session: PuzzleSession, hint) -> None:
     """
-    Find the position of 0 in the puzzle.
+    Print the best next move as the letter to press.
 
     Parameters:
-    puzzle (list) -> A 2D list representing the current state of the puzzle.
-
-    Returns:
-    tuple -> A tuple containing the row and column indices of the empty position.
-    """
-    for row_idx, row in enumerate(puzzle):
-        if 0 in row:
-            return row_idx, row.index(0)
-
-
-def get_valid_moves_prompt(row: int, col: int) -> tuple:
+    session (PuzzleSession) -> The game being played.
+    hint (Future) -> The hint requested from the HintService for the current board.
     """
-    Get the valid moves based on the current position of the empty tile.
+    try:
+        move = hint.result()
+    except ValueError:
+        print("No hint: this puzzle cannot be solved.")
+        return
+    except SolverTimeout:
+        print("No hint available right now.")
+        return
+    if move is not None:
+        print("Hint: press '{}' to move {}.".format(session.keys[DIRECTIONS.index(move)], move))
 
-    Parameters:
-    row (int) -> The row index of the empty position.
-    col (int) -> The column index of the empty position.
 
-    Returns:
-    tuple -> A tuple containing two lists - valid_moves_prompt and valid_moves.
-    """
-    valid_moves_prompt = []
-    valid_moves = []
-    global moves
-
-    if col > 0:
-        valid_moves_prompt.append("{}-{}".format(moves[0], "left"))
-        valid_moves.append(moves[0])
-    if col < 2:
-        valid_moves_prompt.append("{}-{}".format(moves[1], "right"))
-        valid_moves.append(moves[1])
-    if row > 0:
-        valid_moves_prompt.append("{}-{}".format(moves[2], "up"))
-        valid_moves.append(moves[2])
-    if row < 2:
-        valid_moves_prompt.append("{}-{}".format(moves[3], "down"))
-        valid_moves.append(moves[3])
-
-    return valid_moves_prompt, valid_moves
-
-
-def make_move(puzzle: list, total_moves: int) -> None:
+def make_move(session: PuzzleSession, hints: HintService = None) -> None:
     """
     Make a move in the puzzle based on the user's input.
 
     Parameters:
-    puzzle (list) -> A 2D list representing the current state of the puzzle.
-    move (str) -> The move to be made ('left', 'right', 'up', 'down').
+    session (PuzzleSession) -> The game being played, which counts the moves made.
+    hints (HintService) -> Source of hints, or None to play without them.
     """
-    empty_position = find_empty_position(puzzle)
-    row, col = empty_position
-    valid_moves_prompt, valid_moves = get_valid_moves_prompt(row, col)
+    valid_moves_prompt, valid_moves = session.valid_moves()
+    if hints:
+        valid_moves_prompt.append("{}-hint".format(hint_key))
     user_move = input("Enter your move ({}): ".format(", ".join(valid_moves_prompt))).lower()
-    if user_move in valid_moves:
-        if user_move == moves[0] and col > 0:
-            puzzle[row][col], puzzle[row][col - 1] = puzzle[row][col - 1], puzzle[row][col]
-        elif user_move == moves[1] and col < 2:
-            puzzle[row][col], puzzle[row][col + 1] = puzzle[row][col + 1], puzzle[row][col]
-        elif user_move == moves[2] and row > 0:
-            puzzle[row][col], puzzle[row - 1][col] = puzzle[row - 1][col], puzzle[row][col]
-        elif user_move == moves[3] and row < 2:
-            puzzle[row][col], puzzle[row + 1][col] = puzzle[row + 1][col], puzzle[row][col]
-        total_moves += 1
-    else:
+    if hints and user_move == hint_key:
+        # Only asked for when wanted, so the solver never works on positions the player left
+        print_hint(session, hints.request(session.board))
+    elif not session.press(user_move):
         print("Invalid move. Please enter a valid move among the prompt.")
 
 
-def play_puzzle_game() -> int:
+def play_puzzle_game(moves: str, hints: HintService = None) -> int:
     """
     Main function to play the puzzle game.
 
+    Parameters:
+    moves (str) -> The 4 letters for left, right, up and down moves.
+    hints (HintService) -> Source of hints, or None to play without them.
+
     Returns:
     int -> The total number of moves made to solve the puzzle.
     """
-    puzzle = initialize_puzzle()
-
-    total_moves = 0
+    recorder = SessionRecorder(log_path) if log_path else None
+    session = PuzzleSession(moves, initialize_puzzle(), recorder=recorder)
 
-    while not puzzle == [[1, 0, 8], [2, 7, 3], [6, 5, 4]]:
-        print_puzzle(puzzle)
+    try:
+        while not session.solved:
+            print_puzzle(session.board.rows())
 
-        make_move(puzzle, total_moves)
+            make_move(session, hints)
+    finally:
+        if recorder:
+            recorder.close()
 
-    print_puzzle(puzzle)
-    print("Congratulations! You solved the puzzle in {} moves!".format(total_moves))
-    return total_moves
+    print_puzzle(session.board.rows())
+    print("Congratulations! You solved the puzzle in {} moves!".format(session.total_moves))
+    return session.total_moves
 
 
 if __name__ == "__main__":
+    hints = HintService(GOAL.rows())
     while True:
         display_intro()
         moves = get_valid_moves()
 
-        main_total_moves = play_puzzle_game()
+        main_total_moves = play_puzzle_game(moves, hints)
 
         play_again = input("Enter 'n' for another game, or 'q' to end the game: ").lower()
 
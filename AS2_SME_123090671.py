@@ -1,178 +1,175 @@
+import time
 import turtle
+from collections import deque
 import numpy as np
 
+from hint_service import HintService
+from puzzle_board import OFFSETS, PuzzleBoard, generate_puzzle
+from puzzle_render import ShapeTileRenderer, cell_at, tile_metrics
+from session_log import SessionRecorder
+
 # Puzzle colors and settings
 tile_color = "pale green"  # Unfinished tiles
 empty_color = "white"  # Empty tile
 background_color = "white"  # Game window background
 text_color = "blue"  # Text on tiles
 win_color = "red"  # Tiles when the puzzle is solved
-
-# Global variables for the puzzle state and size
-global_puzzle = None  # Current puzzle state
-size = 0  # Puzzle size (n x n)
+animation_time = 0.12  # Seconds a tile takes to slide
+frame_interval = 15  # Milliseconds between animation frames
+renderer_type = ShapeTileRenderer  # Rendering backend for the tiles (offscreen_render has headless ones)
+log_path = None  # Binary log the games are recorded to (see session_log); None to disable
+hint_key = "h"  # Key that asks for the best next move
+hint_poll = 50  # Milliseconds between two looks at a hint being solved
+
+# Global variables for the view; the puzzle state lives in the board
+board = None  # PuzzleBoard being played
+tile_size, gap = tile_metrics(3)  # Tile side and space between tiles, in pixels
 is_animating = False  # Animation state flag
+renderer = None  # Persistent canvas items for the tiles
+animation = None  # Move being animated: (move, (row, col) of the tile, (row, col) of the empty cell, start time)
+click_queue = deque()  # Clicks received while a tile is moving
+recorder = None  # SessionRecorder the moves are logged to, if recording
+session_id = None  # Id of the game in the recorder
+hints = None  # HintService solving hints in the background
 
 
-def shuffle_puzzle(local_puzzle: np.ndarray) -> np.ndarray:
-    """
-    Shuffle the puzzle until a solvable configuration is found.
+def draw_puzzle():
+    """Draw the current state of the puzzle."""
+    global board, renderer
+    if renderer is None or renderer.size != board.size:
+        renderer = renderer_type(turtle.Screen(), board.size, tile_color, empty_color, text_color, tile_size, gap)
+    renderer.tile_color = tile_color
+    renderer.draw(board.tiles)
+    show_progress()
+    turtle.update()
 
-    Args:
-        local_puzzle (np.ndarray): Initial puzzle configuration.
 
-    Returns:
-        np.ndarray: A solvable puzzle configuration.
+def show_progress():
+    """
+    Show how far the board is from the goal in the window title, from the board's running counters.
     """
-    global size
-    size = len(local_puzzle)
-    puzzle_flat = local_puzzle.flatten()
-    np.random.shuffle(puzzle_flat)
-    while not is_solvable(puzzle_flat.reshape((size, size))):
-        np.random.shuffle(puzzle_flat)
-    return puzzle_flat.reshape((size, size))
+    turtle.title("Sliding Puzzle - {} misplaced, at least {} moves to go".format(board.misplaced, board.heuristic))
 
 
-def is_solvable(local_puzzle: np.ndarray) -> bool:
+def on_click(x: float, y: float):
     """
-    Determine whether a puzzle configuration is solvable.
+    Handle click events on the puzzle.
+
+    Clicks that arrive while a tile is moving are queued and handled once it has landed.
 
     Args:
-        local_puzzle (np.ndarray): Puzzle configuration to check.
-
-    Returns:
-        bool: True if solvable, False otherwise.
-    """
-    inversion_count = 0
-    puzzle_flat = local_puzzle.flatten()
-    for i in range(len(puzzle_flat)):
-        for j in range(i + 1, len(puzzle_flat)):
-            if puzzle_flat[j] and puzzle_flat[i] and puzzle_flat[i] > puzzle_flat[j]:
-                inversion_count += 1
-    empty_row = np.where(local_puzzle == 0)[0][0]
-    if len(local_puzzle) % 2 == 0:
-        return (inversion_count + empty_row) % 2 == 1
-    else:
-        return inversion_count % 2 == 0
+        x (float): X-coordinate of the click.
+        y (float): Y-coordinate of the click.
+    """
+    global board, is_animating
+    if board is None:
+        return
+    if is_animating:
+        click_queue.append((x, y))
+        return
+    cell = cell_at(board.size, x, y, tile_size, gap)
+    move = board.move_for(*cell) if cell else None
+    if move:
+        is_animating = True
+        animate_movement(move)
+    elif click_queue:
+        on_click(*click_queue.popleft())
 
 
-def generate_puzzle(s: int) -> np.ndarray:
+def animate_movement(move: str):
     """
-    Generate a random, but solvable, puzzle of a given size.
+    Start animating the tile that a move slides into the empty cell.
 
-    Args:
-        s (int): Size of the puzzle (n x n).
+    The animation runs from screen timers and returns immediately; the tile's position
+    is interpolated from the elapsed time, so it always lands after `animation_time`.
 
-    Returns:
-        np.ndarray: Generated solvable puzzle.
+    Args:
+        move (str): Move of the empty cell, as understood by PuzzleBoard.apply.
     """
-    global global_puzzle, size
-    size = s
-    temp_puzzle = np.arange(1, size**2 + 1) % (size**2)
-    temp_puzzle = temp_puzzle.reshape((size, size))
-    global_puzzle = shuffle_puzzle(temp_puzzle)
-    return global_puzzle
+    global renderer, animation
+    empty_row, empty_col = board.blank
+    d_row, d_col = OFFSETS[move]
+    row, col = empty_row + d_row, empty_col + d_col
+    renderer.hide_number(row, col)  # Move without number
+    animation = (move, (row, col), (empty_row, empty_col), time.perf_counter())
+    turtle.ontimer(animation_frame, 0)
 
 
-def draw_puzzle():
-    """Draw the current state of the puzzle."""
-    global global_puzzle, size
-    turtle.clear()
-    for i in range(size):
-        for j in range(size):
-            draw_tile(j, i, global_puzzle[i, j])
+def animation_frame():
+    """
+    Draw one frame of the running animation and schedule the next, or finish the move.
+    """
+    global animation
+    _, (start_row, start_col), (end_row, end_col), started = animation
+    progress = min(1.0, (time.perf_counter() - started) / animation_time)
+    renderer.place(start_row, start_col, start_col + (end_col - start_col) * progress,
+                   start_row + (end_row - start_row) * progress)
     turtle.update()
+    if progress < 1.0:
+        turtle.ontimer(animation_frame, frame_interval)
+    else:
+        finish_move()
 
 
-def draw_tile(col: int, row: int, number: int, show_number: bool = True):
+def finish_move():
     """
-    Draw a single tile of the puzzle.
-
-    Args:
-        col (int): Column of the tile.
-        row (int): Row of the tile.
-        number (int): Number on the tile.
-        show_number (bool): Whether to show the number.
-    """
-    global size
-    tile_size = 80
-    gap = 5  # Space between tiles
-    x = col * (tile_size + gap) - (size * tile_size + (size - 1) * gap) / 2
-    y = (size * tile_size + (size - 1) * gap) / 2 - row * (tile_size + gap)
-    turtle.penup()
-    turtle.goto(x, y)
-    turtle.pendown()
-    turtle.color(tile_color if number else empty_color)
-    turtle.begin_fill()
-    for _ in range(4):
-        turtle.forward(tile_size)
-        turtle.right(90)
-    turtle.end_fill()
-    if number and show_number:
-        turtle.penup()
-        turtle.goto(x + tile_size / 2, y - 45)  # Adjust text position for centering
-        turtle.color(text_color)
-        turtle.write(number, align="center", font=("Arial", 18, "normal"))
+    Commit the animated move to the board, then handle the next queued click.
+    """
+    global board, is_animating, animation
+    move = animation[0]
+    animation = None
+    renderer.update(board.tiles, board.apply(move))
+    if recorder:
+        recorder.record(session_id, move)
+    show_progress()
+    turtle.update()
+    check_win()
+    is_animating = False  # Reset animation flag
+    if click_queue:
+        on_click(*click_queue.popleft())
 
 
-def on_click(x: float, y: float):
+def show_hint():
     """
-    Handle click events on the puzzle.
-
-    Args:
-        x (float): X-coordinate of the click.
-        y (float): Y-coordinate of the click.
+    Ask for the best next move; the solver runs in the background and the answer is shown
+    in the window title once it is ready, so clicks keep working meanwhile.
     """
-    global global_puzzle, size, is_animating
-    if global_puzzle is None or size == 0 or is_animating:
-        return
-    col = int((x + size * 80 / 2) // 80)
-    row = int((size * 80 / 2 - y) // 80)
-    empty_row, empty_col = np.where(global_puzzle == 0)[0][0], np.where(global_puzzle == 0)[1][0]
-    if abs(col - empty_col) + abs(row - empty_row) == 1:
-        is_animating = True
-        animate_movement((col, row), (empty_col, empty_row), number=global_puzzle[row][col])
-        global_puzzle[empty_row][empty_col], global_puzzle[row][col] = global_puzzle[row][col], 0
-        draw_puzzle()
-        check_win()
-        is_animating = False  # Reset animation flag
+    if board is not None and hints is not None:
+        turtle.title("Sliding Puzzle - thinking about a hint...")
+        watch_hint(hints.request(board), board.tiles.copy())
 
 
-def animate_movement(start: tuple, end: tuple, number: int):
+def watch_hint(future, tiles: np.ndarray):
     """
-    Animate the movement of a tile from start to end position.
+    Show a hint once it is solved, unless the board has changed since it was asked for.
 
     Args:
-        start (tuple): Starting position (col, row) of the tile.
-        end (tuple): Ending position (col, row) of the tile.
-        number (int): Number on the tile being moved.
-    """
-    global size
-    steps = 30  # For smoother animation
-    start_x, start_y = start
-    end_x, end_y = end
-    dx = (end_x - start_x) * 80 / steps
-    dy = (end_y - start_y) * 80 / steps
-    for i in range(steps):
-        draw_tile(start_x, start_y, 0, show_number=False)  # Erase tile
-        start_x += dx / 80
-        start_y += dy / 80
-        draw_tile(start_x, start_y, number, show_number=False)  # Draw without number
-        turtle.update()
-        turtle.speed(1)
-        turtle.delay(10)
-    draw_tile(end_x, end_y, number)  # Redraw tile with number
+        future: Future returned by HintService.request.
+        tiles (np.ndarray): The board the hint was asked for.
+    """
+    if not future.done():
+        turtle.ontimer(lambda: watch_hint(future, tiles), hint_poll)
+        return
+    if not np.array_equal(tiles, board.tiles):
+        return
+    try:
+        move = future.result()
+    except Exception:  # Unsolvable board or solver out of time
+        turtle.title("Sliding Puzzle - no hint available")
+        return
+    if move is None:
+        return
+    empty_row, empty_col = board.blank
+    d_row, d_col = OFFSETS[move]
+    turtle.title("Sliding Puzzle - hint: slide {}".format(board.tiles[empty_row + d_row, empty_col + d_col]))
 
 
 def check_win():
     """
     Check if the current puzzle configuration is solved.
     """
-    global global_puzzle, size
-    if global_puzzle is None or size == 0:
-        return
-    expected = np.arange(1, size**2 + 1) % (size**2)
-    if np.array_equal(global_puzzle.flatten(), expected):
+    global board
+    if board is not None and board.is_solved():
         celebrate_win()
 
 
@@ -180,7 +177,7 @@ def celebrate_win():
     """
     Celebrate solving the puzzle by changing tile colors.
     """
-    global global_puzzle, tile_color, size
+    global tile_color
     tile_color = win_color
     draw_puzzle()
 
@@ -189,21 +186,32 @@ def setup_game():
     """
     Set up the game, including window size and background color, and initialize the puzzle.
     """
-    global global_puzzle, size
-    size = int(turtle.numinput("Sliding Puzzle", "Enter the size of the game (3, 4, 5):", minval=3, maxval=5))
-    if size is None:
+    global board, tile_size, gap, recorder, session_id, hints
+    answer = turtle.numinput("Sliding Puzzle", "Enter the size of the game (3 to 30):", minval=3, maxval=30)
+    if answer is None:
         turtle.bye()
         return
+    size = int(answer)
+    tile_size, gap = tile_metrics(size)
+    extent = size * tile_size + (size - 1) * gap
     screen = turtle.Screen()
-    screen.setup(size * 80 + 20, size * 80 + 20)
+    screen.setup(extent + 20, extent + 20)
     screen.bgcolor(background_color)
     turtle.speed(0)
     turtle.hideturtle()
     turtle.tracer(0, 0)
-    global_puzzle = generate_puzzle(size)
+    board = PuzzleBoard(generate_puzzle(size))
+    if log_path:
+        recorder = SessionRecorder(log_path)
+        session_id = recorder.start(board.tiles)
+    hints = HintService()
     draw_puzzle()
     screen.onscreenclick(on_click)
+    screen.onkey(show_hint, hint_key)
+    screen.listen()
     turtle.done()
+    if recorder:
+        recorder.close()
 
 
 if __name__ == "__main__":
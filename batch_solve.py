@@ -0,0 +1,158 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+
+from puzzle_solver import SolverTimeout, solve
+
+IN_FLIGHT_PER_WORKER = 4  # Boards queued per worker, so huge inputs are never all submitted at once
+
+
+def read_boards(path: str):
+    """
+    Read boards from a .npy batch or from text with one board per line.
+
+    A text line holds the n * n tiles in row-major order, separated by spaces or commas,
+    with 0 for the empty tile. Blank lines and lines starting with '#' are skipped; a line
+    that is not a board is yielded as its error, so the boards after it are still read.
+
+    Args:
+        path (str): Input file, or '-' for standard input.
+
+    Yields:
+        np.ndarray or ValueError: One (n, n) board at a time, or why a line is not a board.
+    """
+    if path.endswith(".npy"):
+        for board in np.load(path, mmap_mode="r"):
+            yield np.array(board, dtype=int)
+        return
+    lines = sys.stdin if path == "-" else open(path)
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                tiles = [int(tile) for tile in line.replace(",", " ").split()]
+            except ValueError:
+                yield ValueError(f"tiles must be integers: {line!r}")
+                continue
+            size = math.isqrt(len(tiles))
+            if size * size != len(tiles):
+                yield ValueError(f"a board needs a square number of tiles, got {len(tiles)}: {line!r}")
+                continue
+            yield np.array(tiles).reshape((size, size))
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def solve_board(index: int, board: np.ndarray, time_limit: float) -> dict:
+    """
+    Solve one board in a worker process and describe the outcome.
+
+    Args:
+        index (int): Position of the board in the input.
+        board (np.ndarray): Configuration to solve.
+        time_limit (float): Seconds before the search is abandoned; None for no limit.
+
+    Returns:
+        dict: JSON-ready result with the status, moves, length, nodes expanded and wall time.
+    """
+    result = {"index": index, "board": board.ravel().tolist()}
+    started = time.perf_counter()
+    try:
+        solution = solve(board, time_limit)
+        result.update(status="solved", moves=solution.moves, length=len(solution.moves), nodes=solution.nodes)
+    except SolverTimeout as error:
+        result.update(status="timeout", nodes=error.nodes)
+    except ValueError as error:
+        result.update(status="error", error=str(error))
+    result["time"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def run(boards, output, workers: int = None, time_limit: float = None) -> int:
+    """
+    Solve boards on a process pool, writing one JSON line per board as soon as it finishes.
+
+    A board that cannot be read or solved gets an "error" line; it never stops the boards
+    after it.
+
+    Args:
+        boards: Iterable of boards, or of exceptions standing for boards that could not be read.
+        output: Text stream receiving the JSON lines.
+        workers (int): Number of processes; defaults to the number of CPUs.
+        time_limit (float): Per-board time limit in seconds.
+
+    Returns:
+        int: Number of boards that were not solved.
+    """
+    workers = workers or os.cpu_count() or 1
+    failures = 0
+    boards = enumerate(boards)
+    pending = {}  # future -> index of its board
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                while len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                    item = next(boards, None)
+                    if item is None:
+                        break
+                    index, board = item
+                    if isinstance(board, Exception):
+                        failures += 1
+                        output.write(json.dumps({"index": index, "status": "error", "error": str(board)}) + "\n")
+                        continue
+                    pending[executor.submit(solve_board, index, board, time_limit)] = index
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        result = {"index": index, "status": "error", "error": f"{type(error).__name__}: {error}"}
+                    failures += result["status"] != "solved"
+                    output.write(json.dumps(result) + "\n")
+                output.flush()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    return failures
+
+
+def main(argv: list = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list): Arguments without the program name; defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit status, 1 if any board was not solved.
+    """
+    parser = argparse.ArgumentParser(description="Solve sliding puzzles in parallel and stream JSON-lines results.")
+    parser.add_argument("input", help="text file with one board per line, a .npy batch, or '-' for stdin")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, help="number of worker processes (default: all cores)")
+    parser.add_argument("-t", "--timeout", type=float, help="per-board time limit in seconds")
+    args = parser.parse_args(argv)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        failures = run(read_boards(args.input), output, args.workers, args.timeout)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
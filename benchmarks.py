@@ -0,0 +1,379 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from functools import partial
+import numpy as np
+
+from puzzle_board import generate_puzzle, is_solvable, shuffle_puzzle
+from puzzle_engine import GOAL, PuzzleSession, scrambled_board
+from snake_core import TICK, GameState, random_inputs
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json")
+THRESHOLD = 0.25  # Allowed slowdown over the baseline before a case counts as a regression
+REPEATS = 11  # Timing runs per case; the median one is kept
+PROCESSES = 7  # Fresh interpreters the suite runs in; the quickest timing of each case is kept
+BATCH = 1000  # Operations per call in cases too quick to time one by one
+REFERENCE_LOOPS = 100000  # Iterations of the reference workload, about 10 ms
+AS2_SIZES = (3, 4, 10, 30, 50)
+MONSTER_STATE = ("monsters", "monster_array", "positions", "monster_cells", "events")  # What move_monsters changes
+
+CASES = {}  # name -> factory returning the function to time
+BATCHES = {}  # name -> operations done by one call of the case's function, if more than one
+
+
+def case(name: str, batch: int = 1):
+    """
+    Register a benchmark: the decorated factory sets up the state and returns the function to time.
+
+    Args:
+        name (str): Name of the case in reports and in the baselines file.
+        batch (int): Operations one call of the function does; times are reported per operation.
+    """
+    def register(factory):
+        CASES[name] = factory
+        if batch > 1:
+            BATCHES[name] = batch
+        return factory
+    return register
+
+
+def reference_work() -> int:
+    """
+    A fixed pure-Python workload. It is timed around every run of a case, so timings can be
+    corrected for how fast the machine happens to be at that moment.
+    """
+    values = list(range(256))
+    total = 0
+    for i in range(REFERENCE_LOOPS):
+        total += values[i & 255] ^ i
+    return total
+
+
+def reference_seconds(repeats: int = REPEATS) -> float:
+    """
+    Returns:
+        float: Median time of reference_work.
+    """
+    return statistics.median(timeit.Timer(reference_work).repeat(repeats, 1))
+
+
+def measure(func, repeats: int = REPEATS) -> float:
+    """
+    Time a function relative to the reference workload. Runs of the function as long as one
+    reference_work alternate with reference_work itself, so each run is compared with the
+    machine's speed just before and after it, and the median ratio is kept: other processes
+    slow both sides alike, and a few odd runs do not move the median.
+
+    Args:
+        func: Function without arguments.
+        repeats (int): Number of timing runs.
+
+    Returns:
+        float: Time per call divided by the time of reference_work.
+    """
+    timer = timeit.Timer(func)
+    reference = timeit.Timer(reference_work)
+    number, elapsed = timer.autorange()
+    number = max(1, round(number * reference.timeit(1) / elapsed))
+    ratios = []
+    before = reference.timeit(1)
+    for _ in range(repeats):
+        elapsed = timer.timeit(number)
+        after = reference.timeit(1)
+        ratios.append(2 * elapsed / number / (before + after))
+        before = after
+    return statistics.median(ratios)
+
+
+# AS2: puzzle generation and the solvability check, from 3x3 up to 50x50
+
+def _as2_is_solvable(size: int):
+    np.random.seed(size)
+    puzzle = np.random.permutation(size * size).reshape((size, size))
+    return partial(is_solvable, puzzle)
+
+
+def _as2_shuffle_puzzle(size: int):
+    np.random.seed(size)
+    goal = (np.arange(1, size**2 + 1) % size**2).reshape((size, size))
+    return partial(shuffle_puzzle, goal)
+
+
+def _as2_generate_puzzle(size: int):
+    np.random.seed(size)
+    return partial(generate_puzzle, size)
+
+
+for _size in AS2_SIZES:
+    CASES[f"as2.is_solvable[{_size}]"] = partial(_as2_is_solvable, _size)
+    CASES[f"as2.shuffle_puzzle[{_size}]"] = partial(_as2_shuffle_puzzle, _size)
+    CASES[f"as2.generate_puzzle[{_size}]"] = partial(_as2_generate_puzzle, _size)
+
+
+# AS1: move application and win checks on the game rules behind the text puzzle
+
+@case("as1.press[4096]")
+def _as1_press():
+    session = PuzzleSession("lrud", scrambled_board(random.Random(1002)))
+    keys = random.Random(1002).choices("lrud", k=4096)
+
+    def presses():
+        for key in keys:
+            session.press(key)
+    return presses
+
+
+def _repeat_solved(session: PuzzleSession):
+    def solved():
+        for _ in range(BATCH):
+            session.solved
+    return solved
+
+
+@case("as1.solved", batch=BATCH)
+def _as1_solved():
+    return _repeat_solved(PuzzleSession("lrud", scrambled_board(random.Random(1002))))
+
+
+@case("as1.solved[goal]", batch=BATCH)
+def _as1_solved_goal():
+    return _repeat_solved(PuzzleSession("lrud", GOAL))
+
+
+# AS3: the per-tick work of the snake game, on the headless core
+
+def _as3_game(seed: int = 1002, monsters: int = 4) -> GameState:
+    """
+    A game in progress: a full-length snake coiled around the centre, and the given number of monsters.
+    """
+    state = GameState(seed, monsters)
+    state.place_snake([(col, row) for row in range(-1, 4)
+                       for col in (range(-2, 3) if row % 2 else range(2, -3, -1))][:21])
+    state.length = state.size = len(state.body)
+    state.direction = "Right"
+    return state
+
+
+@case("as3.step")
+def _as3_step():
+    rng = random.Random(1002)
+    games = [GameState(1002)]
+
+    def tick():
+        games[0].step(TICK, random_inputs(rng))
+        if games[0].outcome:
+            games[0] = GameState(rng.random())
+    return tick
+
+
+@case("as3.caught", batch=BATCH)
+def _as3_caught():
+    caught = _as3_game().caught
+
+    def repeat():
+        for _ in range(BATCH):
+            caught()
+    return repeat
+
+
+@case("as3.check_contact")
+def _as3_check_contact():
+    return _as3_game().check_contact
+
+
+def _repeat_move_monsters(state: GameState):
+    """
+    Time move_monsters from the same start on every call. Left alone, the monsters reach the
+    snake within a few calls and stand still, and the case would time a game where nothing moves.
+    """
+    start = {name: value.copy() for name, value in vars(state).items() if name in MONSTER_STATE}
+
+    def move():
+        for name, value in start.items():
+            setattr(state, name, value.copy())
+        state.move_monsters()
+    return move
+
+
+@case("as3.move_monsters")
+def _as3_move_monsters():
+    return _repeat_move_monsters(_as3_game())
+
+
+@case("as3.flow_field")
+def _as3_flow_field():
+    return _as3_game().flow_field
+
+
+@case("as3.check_contact[300]")
+def _as3_check_contact_crowd():
+    return _as3_game(monsters=300).check_contact
+
+
+@case("as3.move_monsters[300]")
+def _as3_move_monsters_crowd():
+    return _repeat_move_monsters(_as3_game(monsters=300))
+
+
+@case("as3.new_game[300]")
+def _as3_new_game_crowd():
+    return partial(GameState, 1002, 300)
+
+
+def run(names: list, repeats: int = REPEATS, reference: float = None) -> dict:
+    """
+    Time the named cases.
+
+    Args:
+        names (list): Names from CASES.
+        repeats (int): Timing runs per case.
+        reference (float): Seconds reference_work takes at the speed to report in, e.g. the
+            one stored with the baselines; None to measure it now.
+
+    Returns:
+        dict: name -> seconds per call, or per operation for batched cases, at that speed.
+    """
+    if reference is None:
+        reference = reference_seconds(repeats)
+    results = {}
+    for name in names:
+        results[name] = measure(CASES[name](), repeats) * reference / BATCHES.get(name, 1)
+        print("{:<28} {:>12.2f} us".format(name, 1e6 * results[name]), file=sys.stderr)
+    return results
+
+
+def run_processes(names: list, repeats: int = REPEATS, reference: float = None,
+                  processes: int = PROCESSES) -> dict:
+    """
+    Time the named cases with run() in several fresh interpreters. Each process lays out its
+    objects in memory differently, which slows the quickest cases by up to a third in some
+    processes and not in others, so the quickest of the processes is kept.
+
+    Args:
+        names (list): Names from CASES.
+        repeats (int): Timing runs per case in each process.
+        reference (float): As for run(); measured once here if None, so all processes share it.
+        processes (int): Number of processes.
+
+    Returns:
+        dict: name -> seconds per call, or per operation for batched cases, at that speed.
+    """
+    if reference is None:
+        reference = reference_seconds(repeats)
+    command = [sys.executable, os.path.abspath(__file__), "--worker", "--repeats", str(repeats),
+               "--reference", repr(reference)] + names
+    runs = [json.loads(subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      check=True).stdout) for _ in range(processes)]
+    results = {}
+    for name in names:
+        results[name] = min(timings[name] for timings in runs)
+        print("{:<28} {:>12.2f} us".format(name, 1e6 * results[name]), file=sys.stderr)
+    return results
+
+
+def load_baselines(path: str = BASELINE_PATH) -> tuple:
+    """
+    Returns:
+        tuple: (name -> seconds per call, seconds of reference_work they were taken at), or
+        ({}, None) if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}, None
+    with open(path) as f:
+        baselines = json.load(f)
+    return baselines["cases"], baselines.get("reference")
+
+
+def save_baselines(results: dict, reference: float, path: str = BASELINE_PATH) -> None:
+    """
+    Write timings as the new baselines, with the machine and the reference time they were taken at.
+    """
+    baselines = {"python": platform.python_version(), "machine": platform.machine(), "reference": reference,
+                 "cases": {name: results[name] for name in sorted(results)}}
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2)
+        f.write("\n")
+
+
+def compare(results: dict, baselines: dict, threshold: float = THRESHOLD) -> list:
+    """
+    Print every case against its baseline.
+
+    Args:
+        results (dict): name -> seconds per call.
+        baselines (dict): name -> baseline seconds per call.
+        threshold (float): Allowed relative slowdown.
+
+    Returns:
+        list: Names of the cases slower than their baseline by more than the threshold.
+    """
+    regressions = []
+    print("{:<28} {:>12} {:>12} {:>8}".format("case", "us/call", "baseline", "ratio"))
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            print("{:<28} {:>12.2f} {:>12} {:>8}".format(name, 1e6 * seconds, "-", "new"))
+            continue
+        ratio = seconds / baseline
+        status = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            status = "  REGRESSION"
+        print("{:<28} {:>12.2f} {:>12.2f} {:>7.2f}x{}".format(name, 1e6 * seconds, 1e6 * baseline, ratio, status))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """
+    Run the suite and compare it with the stored baselines.
+
+    Returns:
+        int: 1 if any case regressed past the threshold, else 0.
+    """
+    parser = argparse.ArgumentParser(description="Performance suite for the three assignments.")
+    parser.add_argument("patterns", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timing runs per case")
+    parser.add_argument("--processes", type=int, default=PROCESSES, help="interpreters to run the suite in")
+    parser.add_argument("--baselines", default=BASELINE_PATH, help="baselines file")
+    parser.add_argument("--update", action="store_true", help="store the timings as the new baselines")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    # Used by run_processes: time exactly the named cases and print the timings as JSON
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--reference", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        print(json.dumps(run(args.patterns, args.repeats, args.reference)))
+        return 0
+    names = [name for name in CASES if not args.patterns or any(p in name for p in args.patterns)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    baselines, reference = load_baselines(args.baselines)
+    if reference is None:
+        reference = reference_seconds(args.repeats)
+    # Timings are reported at the speed the baselines were taken at, so they compare directly
+    if args.processes > 1:
+        results = run_processes(names, args.repeats, reference, args.processes)
+    else:
+        results = run(names, args.repeats, reference)
+    if args.update:
+        baselines.update(results)
+        save_baselines(baselines, reference, args.baselines)
+        print("Stored {} baselines in {}".format(len(results), args.baselines))
+        return 0
+    regressions = compare(results, baselines, args.threshold)
+    if regressions:
+        print("{} regression(s) over {:.0%}: {}".format(len(regressions), args.threshold, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import heapq
+import sys
+import time
+import numpy as np
+
+from packed_board import MAX_CELLS, find_blank, move_targets, pack, slide
+from puzzle_board import PuzzleBoard
+from puzzle_solver import CLOCK_INTERVAL, OPPOSITE, Solution, SolverTimeout, scramble
+from puzzle_table import AS1_GOAL
+
+FORWARD, BACKWARD = 0, 1
+
+
+def reachable(start: np.ndarray, goal: np.ndarray) -> bool:
+    """
+    Check whether a board can be turned into another one by sliding tiles.
+
+    Both boards are reachable from each other exactly when the permutation taking one to
+    the other (the blank included) has the same parity as the blank's taxicab distance.
+
+    Args:
+        start (np.ndarray): First configuration.
+        goal (np.ndarray): Second configuration of the same size.
+
+    Returns:
+        bool: True if one board can be reached from the other.
+    """
+    first, second = start.ravel().tolist(), goal.ravel().tolist()
+    cell_of = {tile: index for index, tile in enumerate(second)}
+    mapping = [cell_of[tile] for tile in first]
+    parity, seen = 0, [False] * len(mapping)
+    for index in range(len(mapping)):
+        length = 0
+        while not seen[index]:
+            seen[index] = True
+            index = mapping[index]
+            length += 1
+        parity += max(0, length - 1)
+    size = len(start)
+    start_row, start_col = divmod(first.index(0), size)
+    goal_row, goal_col = divmod(second.index(0), size)
+    return parity % 2 == (abs(start_row - goal_row) + abs(start_col - goal_col)) % 2
+
+
+def _distances(board: list, size: int) -> list:
+    """
+    Tabulate the Manhattan distance of every tile on every cell to its cell on a board.
+
+    Returns:
+        list: distances[tile][cell], with zeros for the blank.
+    """
+    cells = size * size
+    distances = [[0] * cells for _ in range(cells)]
+    for target, tile in enumerate(board):
+        if tile:
+            target_row, target_col = divmod(target, size)
+            for cell in range(cells):
+                row, col = divmod(cell, size)
+                distances[tile][cell] = abs(row - target_row) + abs(col - target_col)
+    return distances
+
+
+def bidirectional_search(start, goal, heuristic: bool = True, time_limit: float = None) -> Solution:
+    """
+    Find a shortest sequence of blank moves between any two boards of the same size.
+
+    Both frontiers grow at once and keep their states as packed integers in dicts, so a state
+    reached from both sides is found with a single hash lookup. Nodes are expanded in the
+    order of max(f, 2g) (the MM rule), which stops as soon as the best meeting found so far
+    cannot be beaten and therefore still returns an optimal path. With heuristic=False this
+    is a plain bidirectional breadth-first search.
+
+    Args:
+        start: Starting configuration (np.ndarray or nested lists), at most 4 x 4.
+        goal: Target configuration of the same size, e.g. the AS1 or AS2 goal.
+        heuristic (bool): Guide both searches with the Manhattan distance to the opposite board.
+        time_limit (float): Seconds after which the search gives up; None for no limit.
+
+    Returns:
+        Solution: The moves of the blank and the number of nodes expanded.
+
+    Raises:
+        ValueError: If the boards differ in size, are too large, or cannot reach each other.
+        SolverTimeout: If the time limit is reached first.
+    """
+    start, goal = np.asarray(start), np.asarray(goal)
+    size = len(start)
+    if start.shape != goal.shape or start.shape != (size, size):
+        raise ValueError(f"boards must be square and the same size, got {start.shape} and {goal.shape}")
+    if size * size > MAX_CELLS:
+        raise ValueError(f"packed boards hold at most {MAX_CELLS} cells, got {size}x{size}")
+    if sorted(start.ravel().tolist()) != sorted(goal.ravel().tolist()):
+        raise ValueError("the boards do not hold the same tiles")
+    if not reachable(start, goal):
+        raise ValueError("the goal cannot be reached from the start (different parity)")
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    boards = (start.ravel().tolist(), goal.ravel().tolist())
+    # Each side is guided towards the board the other side starts from
+    distances = [_distances(boards[BACKWARD], size), _distances(boards[FORWARD], size)] if heuristic else None
+    targets = move_targets(size)
+    costs = ({}, {})  # Per side: packed state -> moves from that side's board
+    parents = ({}, {})  # Per side: packed state -> move of the blank that reached it
+    frontiers = ([], [])  # Per side: heap of (priority, g, h, state, blank)
+    for side, board in enumerate(boards):
+        state = pack(board)
+        h = sum(distances[side][tile][cell] for cell, tile in enumerate(board)) if heuristic else 0
+        costs[side][state] = 0
+        parents[side][state] = None
+        heapq.heappush(frontiers[side], (h, 0, h, state, board.index(0)))
+    best, meeting = (0, pack(boards[FORWARD])) if boards[FORWARD] == boards[BACKWARD] else (float("inf"), None)
+    nodes = 0
+    while frontiers[FORWARD] and frontiers[BACKWARD]:
+        for frontier, cost in zip(frontiers, costs):
+            while frontier and frontier[0][1] > cost[frontier[0][3]]:
+                heapq.heappop(frontier)  # Stale entry: the state was reached more cheaply since
+        if not (frontiers[FORWARD] and frontiers[BACKWARD]):
+            break
+        if best <= min(frontiers[FORWARD][0][0], frontiers[BACKWARD][0][0]):
+            break
+        side = FORWARD if frontiers[FORWARD][0][0] <= frontiers[BACKWARD][0][0] else BACKWARD
+        _, g, h, state, blank = heapq.heappop(frontiers[side])
+        nodes += 1
+        if deadline is not None and not nodes & CLOCK_INTERVAL and time.perf_counter() > deadline:
+            raise SolverTimeout(nodes)
+        cost, other, parent = costs[side], costs[1 - side], parents[side]
+        for move, target in targets[blank].items():
+            child = slide(state, blank, target)
+            if g + 1 >= cost.get(child, g + 2):
+                continue
+            cost[child] = g + 1
+            parent[child] = move
+            if child in other and g + 1 + other[child] < best:
+                best, meeting = g + 1 + other[child], child
+            child_h = 0
+            if heuristic:
+                tile = (state >> (4 * target)) & 15
+                child_h = h + distances[side][tile][blank] - distances[side][tile][target]
+            heapq.heappush(frontiers[side], (max(g + 1 + child_h, 2 * (g + 1)), g + 1, child_h, child, target))
+    if meeting is None:
+        raise ValueError("the goal cannot be reached from the start")
+    return Solution(_path(meeting, parents[FORWARD], size)[::-1]
+                    + [OPPOSITE[move] for move in _path(meeting, parents[BACKWARD], size)], nodes)
+
+
+def _path(state: int, parents: dict, size: int) -> list:
+    """
+    Walk the parent moves of one side back from a state to that side's board.
+
+    Returns:
+        list: The moves recorded along the way, from the state back to the board.
+    """
+    targets = move_targets(size)
+    blank = find_blank(state, size * size)
+    moves = []
+    while parents[state] is not None:
+        move = parents[state]
+        moves.append(move)
+        target = targets[blank][OPPOSITE[move]]
+        state, blank = slide(state, blank, target), target
+    return moves
+
+
+def benchmark(seed: int = 1002) -> None:
+    """
+    Time the search towards the AS1 goal on random 3x3 boards, and on 4x4 boards scrambled
+    by a walk that never steps straight back from a shuffled (non-canonical) 4x4 goal.
+
+    Args:
+        seed (int): Seed for the boards.
+    """
+    rng = np.random.default_rng(seed)
+    as1_goal = np.array(AS1_GOAL)
+    groups = {"3x3 to AS1 goal": []}
+    while len(groups["3x3 to AS1 goal"]) < 20:
+        board = rng.permutation(9).reshape((3, 3))
+        if reachable(board, as1_goal):
+            groups["3x3 to AS1 goal"].append((board, as1_goal))
+    for steps in (30, 40, 50):
+        pairs = groups[f"4x4 walk {steps}"] = []
+        for _ in range(10):
+            board = PuzzleBoard(scramble(4, 200, rng))
+            goal, previous = board.tiles.copy(), None
+            for _ in range(steps):
+                moves = [move for move in board.legal_moves() if move != OPPOSITE.get(previous)]
+                previous = moves[rng.integers(len(moves))]
+                board.apply(previous)
+            pairs.append((board.tiles, goal))
+    for label, pairs in groups.items():
+        started = time.perf_counter()
+        results = [bidirectional_search(start, goal) for start, goal in pairs]
+        elapsed = time.perf_counter() - started
+        count = len(pairs)
+        print("{:<16} boards:{:>3}  avg time:{:>8.4f}s  avg nodes:{:>9.0f}  avg length:{:>5.1f}".format(
+            label, count, elapsed / count, sum(r.nodes for r in results) / count,
+            sum(len(r.moves) for r in results) / count))
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1002)
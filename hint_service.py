@@ -0,0 +1,226 @@
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+
+import puzzle_table
+from bidirectional_search import bidirectional_search
+from packed_board import MAX_CELLS, PackedBoard, pack
+from puzzle_board import PuzzleBoard
+from puzzle_solver import goal_board, solve
+
+CAPACITY = 65536  # Positions kept in the cache
+TIME_LIMIT = 10.0  # Seconds a solve may take before the hint is given up
+# 3x3 goals answered from a distance table, and the file each table is cached in
+TABLE_PATHS = {puzzle_table.AS1_GOAL: puzzle_table.DEFAULT_TABLE_PATH, puzzle_table.AS2_GOAL: puzzle_table.AS2_TABLE_PATH}
+
+
+class HintService:
+    """
+    Answers "what is the best next move?" for boards of one puzzle.
+
+    3x3 boards for the AS1 and AS2 goals are answered straight from a distance table (see
+    puzzle_table), built on first use and cached on disk. Other answers live in a bounded
+    LRU cache keyed by the packed board, so popular positions are answered with a dict
+    lookup. Misses are solved on a single background thread and handed back as futures, so
+    a UI thread never waits on the solver. Every position along a solution found is cached
+    too, since the rest of an optimal path is optimal as well.
+    """
+
+    def __init__(self, goal=None, capacity: int = CAPACITY, time_limit: float = TIME_LIMIT):
+        """
+        Args:
+            goal: Target configuration, e.g. the AS1 goal; None for the AS2 goal of each board's size.
+            capacity (int): Most positions kept in the cache.
+            time_limit (float): Seconds a solve may take; None for no limit.
+        """
+        self.goal = None if goal is None else np.asarray(goal)
+        self.capacity = capacity
+        self.time_limit = time_limit
+        self.cache = OrderedDict()  # packed board -> move of the blank, least recently used first
+        self.pending = {}  # packed board -> future of a solve not finished yet
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+        self.tables = {}  # 3x3 goal as nested tuples -> its distance table, or None if there is none
+        self.jobs = queue.Queue()
+        # A daemon thread, so a long solve never keeps the game from exiting
+        self.worker = threading.Thread(target=self._work, name="hint-solver", daemon=True)
+        self.worker.start()
+
+    @staticmethod
+    def _tiles(board) -> np.ndarray:
+        if isinstance(board, PackedBoard):
+            return np.array(board.rows())
+        if isinstance(board, PuzzleBoard):
+            return board.tiles.copy()
+        return np.array(board)
+
+    @staticmethod
+    def _key(tiles: np.ndarray):
+        return pack(tiles.ravel()) if tiles.size <= MAX_CELLS else tiles.tobytes()
+
+    def _goal_for(self, tiles: np.ndarray) -> np.ndarray:
+        return goal_board(len(tiles)) if self.goal is None else self.goal
+
+    def _table_for(self, tiles: np.ndarray):
+        if tiles.shape != (3, 3):
+            return None
+        goal = tuple(tuple(int(tile) for tile in row) for row in self._goal_for(tiles))
+        if goal not in self.tables:
+            path = TABLE_PATHS.get(goal)
+            self.tables[goal] = puzzle_table.get_distance_table(path, goal) if path else None
+        return self.tables[goal]
+
+    def cached(self, board):
+        """
+        Look a board up in the cache without solving anything.
+
+        Args:
+            board: np.ndarray, nested lists, PackedBoard or PuzzleBoard.
+
+        Returns:
+            str or None: The best move of the blank, or None if the board is not cached.
+        """
+        tiles = self._tiles(board)
+        table = self._table_for(tiles)
+        if table is not None:
+            return puzzle_table.best_move(table, tiles)
+        key = self._key(tiles)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key]
+        return None
+
+    def request(self, board) -> Future:
+        """
+        Ask for the best move of a board.
+
+        Args:
+            board: np.ndarray, nested lists, PackedBoard or PuzzleBoard.
+
+        Returns:
+            Future: Resolves to the move of the blank ('up', 'down', 'left' or 'right'), or None if
+            the board is already solved. It fails with ValueError if the goal cannot be reached, or
+            SolverTimeout if the solve runs out of time. Boards answered from a distance table or
+            the cache return a finished future.
+        """
+        tiles = self._tiles(board)
+        table = self._table_for(tiles)
+        if table is not None:
+            future = Future()
+            if puzzle_table.moves_remaining(table, tiles) is None:
+                future.set_exception(ValueError("puzzle is not solvable"))
+            else:
+                future.set_result(puzzle_table.best_move(table, tiles))
+            return future
+        key = self._key(tiles)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                future = Future()
+                future.set_result(self.cache[key])
+                return future
+            if key in self.pending:
+                return self.pending[key]
+            self.misses += 1
+            future = self.pending[key] = Future()
+        if np.array_equal(tiles, self._goal_for(tiles)):
+            self._finish(key, future, result=None)
+        else:
+            self.jobs.put((key, tiles, future))
+        return future
+
+    def hint(self, board, timeout: float = None):
+        """
+        Get the best move of a board, waiting for the solver if needed.
+
+        Args:
+            board: np.ndarray, nested lists, PackedBoard or PuzzleBoard.
+            timeout (float): Seconds to wait; None to wait for the solve.
+
+        Returns:
+            str or None: The move of the blank, or None if the board is already solved.
+        """
+        return self.request(board).result(timeout)
+
+    def _store(self, key, move: str) -> None:
+        self.cache[key] = move
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+
+    def _finish(self, key, future: Future, result=None, error: Exception = None) -> None:
+        with self.lock:
+            self.pending.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def _solve(self, tiles: np.ndarray) -> list:
+        goal = self._goal_for(tiles)
+        if self.goal is None:
+            return solve(tiles, self.time_limit).moves
+        return bidirectional_search(tiles, goal, time_limit=self.time_limit).moves
+
+    def _work(self) -> None:
+        while True:
+            key, tiles, future = self.jobs.get()
+            if not future.set_running_or_notify_cancel():
+                with self.lock:
+                    self.pending.pop(key, None)
+                continue
+            try:
+                moves = self._solve(tiles)
+            except Exception as error:
+                self._finish(key, future, error=error)
+                continue
+            board = PuzzleBoard(tiles)
+            with self.lock:
+                for move in moves:
+                    self._store(self._key(board.tiles), move)
+                    board.apply(move)
+            self._finish(key, future, result=moves[0] if moves else None)
+
+
+def benchmark(boards: int = 200, repeats: int = 10000, seed: int = 1002) -> None:
+    """
+    Time hints on random 3x3 boards: for the AS1 goal, answered from its distance table, and
+    for a goal without a table, first solved and then repeated from the cache.
+
+    Args:
+        boards (int): Solvable boards to ask about per goal.
+        repeats (int): Lookups to time per goal.
+        seed (int): Seed for the boards.
+    """
+    from bidirectional_search import reachable
+    rng = np.random.default_rng(seed)
+    puzzle_table.get_distance_table()  # Built once here if missing, outside the timings
+    # The AS1 goal, and its mirror image, which has no table
+    for label, goal in (("AS1 goal", np.array(puzzle_table.AS1_GOAL)),
+                        ("untabled goal", np.array(puzzle_table.AS1_GOAL)[:, ::-1])):
+        puzzles = []
+        while len(puzzles) < boards:
+            board = rng.permutation(9).reshape((3, 3))
+            if reachable(board, goal):
+                puzzles.append(board)
+        service = HintService(goal)
+        started = time.perf_counter()
+        for board in puzzles:
+            service.hint(board)
+        first = time.perf_counter()
+        for index in range(repeats):
+            service.hint(puzzles[index % boards])
+        repeated = time.perf_counter()
+        print("{}: first hints {:.1f} us each, repeated hints {:.1f} us each, {} positions cached".format(
+            label, 1e6 * (first - started) / boards, 1e6 * (repeated - first) / repeats, len(service.cache)))
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:]))
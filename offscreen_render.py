@@ -0,0 +1,344 @@
+import os
+import struct
+from abc import ABC, abstractmethod
+import sys
+import time
+import zlib
+import numpy as np
+
+TILE_SIZE = 80
+GAP = 5  # Space between tiles
+MARGIN = 10  # Border around the board, as in the turtle window
+FONT_SIZE = 18  # Font size for TILE_SIZE tiles, scaled with the tiles
+
+COLORS = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "pale green": (152, 251, 152),
+    "blue": (0, 0, 255),
+    "red": (255, 0, 0),
+    "purple": (160, 32, 240),
+}
+
+# 3x5 bitmaps of the digits, one string of 15 pixels per digit, read row by row
+DIGITS = {
+    "0": "111101101101111", "1": "010110010010111", "2": "111001111100111", "3": "111001111001111",
+    "4": "101101111001001", "5": "111100111001111", "6": "111100111101111", "7": "111001001001001",
+    "8": "111101111101111", "9": "111101111001111",
+}
+GLYPHS = {digit: np.array([bit == "1" for bit in bits]).reshape((5, 3)) for digit, bits in DIGITS.items()}
+
+# Blank moves used by the solvers, as (row offset, column offset)
+MOVE_OFFSETS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+def rgb(color: str) -> tuple:
+    """
+    Convert a colour name used by the games, or '#rrggbb', to an RGB triple.
+
+    Args:
+        color (str): The colour.
+
+    Returns:
+        tuple: (red, green, blue) from 0 to 255.
+    """
+    if color.startswith("#") and len(color) == 7:
+        return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+    try:
+        return COLORS[color]
+    except KeyError:
+        raise ValueError(f"unknown colour {color!r}") from None
+
+
+def svg_color(color: str) -> str:
+    """
+    Returns:
+        str: The colour as '#rrggbb', since SVG does not know all Tk colour names.
+    """
+    return "#{:02x}{:02x}{:02x}".format(*rgb(color))
+
+
+def write_png(path: str, image: np.ndarray) -> None:
+    """
+    Write an RGB image as an 8-bit PNG file without any imaging library.
+
+    Args:
+        path (str): Destination file.
+        image (np.ndarray): (height, width, 3) uint8 array.
+    """
+    height, width, _ = image.shape
+    # Every scanline starts with filter type 0
+    scanlines = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape((height, width * 3))], axis=1)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+class OffscreenRenderer(ABC):
+    """
+    Render target that keeps the board in memory instead of drawing on a Tk window.
+
+    It offers the same methods as the renderers in puzzle_render (update, draw, place and
+    hide_number), so it can stand in for them, and turns the current state into a frame on
+    demand. Subclasses provide the drawing primitives and the file format; one that misses
+    any of them cannot be instantiated.
+    """
+
+    extension = ""
+
+    def __init__(self, screen, size: int, tile_color: str, empty_color: str, text_color: str,
+                 tile_size: int = TILE_SIZE, gap: int = GAP, background_color: str = "white"):
+        """
+        Args:
+            screen: Unused; accepted so the renderer can be built like the on-screen ones.
+            size (int): Size of the puzzle (n x n).
+            tile_color (str): Fill of the numbered tiles.
+            empty_color (str): Fill of the empty cell.
+            text_color (str): Colour of the numbers.
+            tile_size (int): Side of a tile in pixels.
+            gap (int): Space between tiles in pixels.
+            background_color (str): Colour around and between the tiles.
+        """
+        self.size = size
+        self.tile_color = tile_color
+        self.empty_color = empty_color
+        self.text_color = text_color
+        self.background_color = background_color
+        self.tile_size = tile_size
+        self.gap = gap
+        self.extent = size * tile_size + (size - 1) * gap + 2 * MARGIN
+        self.numbers = {}  # (row, col) -> number shown there
+        self.offsets = {}  # (row, col) -> (column, row) the cell is drawn at while animating
+        self.hidden = set()  # Cells whose number is hidden
+
+    def place(self, row: int, col: int, x_col: float, y_row: float) -> None:
+        """
+        Draw a cell at another grid position, which may be fractional while animating.
+        """
+        self.offsets[row, col] = (x_col, y_row)
+
+    def hide_number(self, row: int, col: int) -> None:
+        """
+        Hide the number of a cell until it is next updated.
+        """
+        self.hidden.add((row, col))
+
+    def update(self, puzzle: np.ndarray, cells: list) -> None:
+        """
+        Refresh the listed cells from the puzzle and put them back on the grid.
+
+        Args:
+            puzzle (np.ndarray): Current puzzle state.
+            cells (list): (row, col) pairs that changed.
+        """
+        for row, col in cells:
+            self.numbers[row, col] = int(puzzle[row, col])
+            self.offsets.pop((row, col), None)
+            self.hidden.discard((row, col))
+
+    def draw(self, puzzle: np.ndarray) -> None:
+        """
+        Refresh every cell.
+
+        Args:
+            puzzle (np.ndarray): Current puzzle state.
+        """
+        self.update(puzzle, [(row, col) for row in range(self.size) for col in range(self.size)])
+
+    def render(self):
+        """
+        Produce a frame of the current state; moving cells are drawn last so they stay on top.
+
+        Returns:
+            The frame in the subclass's format.
+        """
+        self._begin()
+        cells = sorted(self.numbers, key=lambda cell: cell in self.offsets)
+        for row, col in cells:
+            number = self.numbers[row, col]
+            x_col, y_row = self.offsets.get((row, col), (col, row))
+            x = MARGIN + x_col * (self.tile_size + self.gap)
+            y = MARGIN + y_row * (self.tile_size + self.gap)
+            self._tile(x, y, number, (row, col) not in self.hidden)
+        return self._end()
+
+    @abstractmethod
+    def save(self, path: str) -> None:
+        """
+        Render the current state and write it to a file.
+
+        Args:
+            path (str): Destination file.
+        """
+
+    @abstractmethod
+    def _begin(self) -> None:
+        """
+        Start a frame with the background.
+        """
+
+    @abstractmethod
+    def _tile(self, x: float, y: float, number: int, show_number: bool) -> None:
+        """
+        Draw one cell with its top-left corner at (x, y) pixels.
+        """
+
+    @abstractmethod
+    def _end(self):
+        """
+        Returns:
+            The finished frame.
+        """
+
+
+class RasterRenderer(OffscreenRenderer):
+    """
+    Renders frames into an RGB NumPy array and saves them as PNG.
+
+    Numbers use a built-in 3x5 pixel font scaled to the tile size. Every tile is composed
+    once per number and colour and then copied into the frame as a single block.
+    """
+
+    extension = ".png"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.image = np.empty((self.extent, self.extent, 3), dtype=np.uint8)
+        self.scale = max(1, self.tile_size // 16)
+        self.backgrounds = {}  # colour -> blank frame
+        self.sprites = {}  # (number, fill, text colour, number shown) -> tile image
+
+    def _glyph(self, number: int) -> np.ndarray:
+        parts = []
+        for digit in str(number):
+            parts += [GLYPHS[digit], np.zeros((5, 1), dtype=bool)]
+        mask = np.concatenate(parts[:-1], axis=1)
+        return mask.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+
+    def _sprite(self, number: int, show_number: bool) -> np.ndarray:
+        fill = self.tile_color if number else self.empty_color
+        key = (number, fill, self.text_color, show_number and number != 0)
+        if key not in self.sprites:
+            sprite = np.empty((self.tile_size, self.tile_size, 3), dtype=np.uint8)
+            sprite[:] = rgb(fill)
+            if key[3]:
+                mask = self._glyph(number)
+                height, width = mask.shape
+                if width <= self.tile_size:
+                    top = (self.tile_size - height) // 2
+                    left = (self.tile_size - width) // 2
+                    sprite[top:top + height, left:left + width][mask] = rgb(self.text_color)
+            self.sprites[key] = sprite
+        return self.sprites[key]
+
+    def _begin(self) -> None:
+        if self.background_color not in self.backgrounds:
+            background = np.empty_like(self.image)
+            background[:] = rgb(self.background_color)
+            self.backgrounds[self.background_color] = background
+        np.copyto(self.image, self.backgrounds[self.background_color])
+
+    def _tile(self, x: float, y: float, number: int, show_number: bool) -> None:
+        x, y = int(round(x)), int(round(y))
+        self.image[y:y + self.tile_size, x:x + self.tile_size] = self._sprite(number, show_number)
+
+    def _end(self) -> np.ndarray:
+        return self.image
+
+    def save(self, path: str) -> None:
+        write_png(path, self.render())
+
+
+class SvgRenderer(OffscreenRenderer):
+    """
+    Renders frames as SVG documents.
+    """
+
+    extension = ".svg"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.font_size = max(6, FONT_SIZE * self.tile_size // TILE_SIZE)
+        self.parts = []
+
+    def _begin(self) -> None:
+        self.parts = ['<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{0}">'.format(self.extent),
+                      '<rect width="100%" height="100%" fill="{}"/>'.format(svg_color(self.background_color))]
+
+    def _tile(self, x: float, y: float, number: int, show_number: bool) -> None:
+        self.parts.append('<rect x="{:g}" y="{:g}" width="{}" height="{}" fill="{}"/>'.format(
+            x, y, self.tile_size, self.tile_size, svg_color(self.tile_color if number else self.empty_color)))
+        if number and show_number:
+            self.parts.append('<text x="{:g}" y="{:g}" font-family="Arial" font-size="{}" fill="{}" '
+                              'text-anchor="middle" dominant-baseline="central">{}</text>'.format(
+                                  x + self.tile_size / 2, y + self.tile_size / 2, self.font_size,
+                                  svg_color(self.text_color), number))
+
+    def _end(self) -> str:
+        self.parts.append("</svg>")
+        return "\n".join(self.parts)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write(self.render())
+
+
+def export_playback(renderer: OffscreenRenderer, puzzle: np.ndarray, moves: list, directory: str,
+                    prefix: str = "frame") -> list:
+    """
+    Save one image per step of a solution, starting with the initial board.
+
+    Args:
+        renderer (OffscreenRenderer): Target to render with.
+        puzzle (np.ndarray): Initial configuration; it is not modified.
+        moves (list): Moves of the blank ('up', 'down', 'left', 'right'), as returned by the solvers.
+        directory (str): Directory receiving the images.
+        prefix (str): Start of every file name.
+
+    Returns:
+        list: Paths of the images written, in order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    board = puzzle.copy()
+    row, col = (int(i[0]) for i in np.where(board == 0))
+    renderer.draw(board)
+    paths = []
+    for step in range(len(moves) + 1):
+        if step:
+            d_row, d_col = MOVE_OFFSETS[moves[step - 1]]
+            board[row, col], board[row + d_row, col + d_col] = board[row + d_row, col + d_col], 0
+            renderer.update(board, [(row, col), (row + d_row, col + d_col)])
+            row, col = row + d_row, col + d_col
+        path = os.path.join(directory, "{}_{:04d}{}".format(prefix, step, renderer.extension))
+        renderer.save(path)
+        paths.append(path)
+    return paths
+
+
+def benchmark(frames: int = 2000) -> None:
+    """
+    Print how many frames per second each offscreen renderer produces for 3x3 to 5x5 boards.
+
+    Args:
+        frames (int): Frames rendered per renderer and size.
+    """
+    rng = np.random.default_rng(1002)
+    for renderer_type in (RasterRenderer, SvgRenderer):
+        for size in (3, 4, 5):
+            renderer = renderer_type(None, size, "pale green", "white", "blue")
+            renderer.draw(rng.permutation(size * size).reshape((size, size)))
+            started = time.perf_counter()
+            for _ in range(frames):
+                renderer.render()
+            elapsed = time.perf_counter() - started
+            print("{:<15} {}x{}: {:>8.0f} frames/sec".format(renderer_type.__name__, size, size, frames / elapsed))
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,201 @@
+MAX_CELLS = 16  # Tiles must fit in 4 bits
+DIRECTIONS = ("left", "right", "up", "down")  # Moves of the blank, in the order of the AS1 prompt
+
+
+def pack(tiles) -> int:
+    """
+    Pack a flat sequence of tiles into one integer, 4 bits per cell, first cell lowest.
+
+    Args:
+        tiles: Flat sequence of tiles, 0 being the blank.
+
+    Returns:
+        int: The packed state.
+    """
+    state = 0
+    for index, tile in enumerate(tiles):
+        state |= int(tile) << (4 * index)
+    return state
+
+
+def unpack(state: int, cells: int) -> list:
+    """
+    Unpack a state produced by pack.
+
+    Args:
+        state (int): The packed state.
+        cells (int): Number of cells on the board.
+
+    Returns:
+        list: Flat list of tiles.
+    """
+    return [(state >> (4 * index)) & 15 for index in range(cells)]
+
+
+def find_blank(state: int, cells: int) -> int:
+    """
+    Find the cell holding the blank in a packed state.
+
+    Args:
+        state (int): The packed state.
+        cells (int): Number of cells on the board.
+
+    Returns:
+        int: Index of the blank cell.
+    """
+    for index in range(cells):
+        if not (state >> (4 * index)) & 15:
+            return index
+    raise ValueError("board has no blank")
+
+
+def slide(state: int, blank: int, target: int) -> int:
+    """
+    Move the blank from one cell to another by swapping their nibbles.
+
+    Args:
+        state (int): The packed state.
+        blank (int): Index of the blank cell.
+        target (int): Index of the cell whose tile slides into the blank.
+
+    Returns:
+        int: The new packed state.
+    """
+    tile = (state >> (4 * target)) & 15
+    return state + (tile << (4 * blank)) - (tile << (4 * target))
+
+
+_targets = {}
+
+
+def move_targets(size: int) -> list:
+    """
+    Tabulate where the blank lands for every cell and direction.
+
+    Args:
+        size (int): Size of the board (n x n).
+
+    Returns:
+        list: For each cell, a dict mapping the legal directions to the target cell.
+    """
+    if size not in _targets:
+        table = []
+        for index in range(size * size):
+            row, col = divmod(index, size)
+            targets = {}
+            if col > 0:
+                targets["left"] = index - 1
+            if col < size - 1:
+                targets["right"] = index + 1
+            if row > 0:
+                targets["up"] = index - size
+            if row < size - 1:
+                targets["down"] = index + size
+            table.append(targets)
+        _targets[size] = table
+    return _targets[size]
+
+
+class PackedBoard:
+    """
+    A sliding-puzzle board held in a single integer with the blank position cached.
+
+    Moves are nibble swaps and equality and hashing work on the integer, so boards are
+    cheap to compare and to keep in sets and dicts.
+    """
+
+    __slots__ = ("state", "blank", "size")
+
+    def __init__(self, state: int, size: int = 3, blank: int = None):
+        """
+        Args:
+            state (int): The packed state.
+            size (int): Size of the board (n x n), at most 4.
+            blank (int): Index of the blank cell, found from the state if omitted.
+        """
+        if size * size > MAX_CELLS:
+            raise ValueError(f"packed boards hold at most {MAX_CELLS} cells, got {size}x{size}")
+        self.state = state
+        self.size = size
+        self.blank = find_blank(state, size * size) if blank is None else blank
+
+    @classmethod
+    def from_rows(cls, rows) -> "PackedBoard":
+        """
+        Build a packed board from nested rows, as used by AS1.
+
+        Args:
+            rows: A 2D list (or tuple / ndarray) of tiles.
+
+        Returns:
+            PackedBoard: The packed board.
+        """
+        return cls(pack(tile for row in rows for tile in row), len(rows))
+
+    def rows(self) -> list:
+        """
+        Unpack the board into nested rows.
+
+        Returns:
+            list: A 2D list of tiles.
+        """
+        tiles = unpack(self.state, self.size * self.size)
+        return [tiles[i:i + self.size] for i in range(0, len(tiles), self.size)]
+
+    def blank_position(self) -> tuple:
+        """
+        Returns:
+            tuple: Row and column of the blank.
+        """
+        return divmod(self.blank, self.size)
+
+    def legal_moves(self) -> list:
+        """
+        Returns:
+            list: Directions the blank can move in, in the order of DIRECTIONS.
+        """
+        return list(move_targets(self.size)[self.blank])
+
+    def move(self, direction: str) -> bool:
+        """
+        Move the blank in place.
+
+        Args:
+            direction (str): 'left', 'right', 'up' or 'down'.
+
+        Returns:
+            bool: True if the move was legal and made.
+        """
+        target = move_targets(self.size)[self.blank].get(direction)
+        if target is None:
+            return False
+        self.state = slide(self.state, self.blank, target)
+        self.blank = target
+        return True
+
+    def moved(self, direction: str) -> "PackedBoard":
+        """
+        Args:
+            direction (str): 'left', 'right', 'up' or 'down'.
+
+        Returns:
+            PackedBoard or None: A new board after the move, or None if it is illegal.
+        """
+        target = move_targets(self.size)[self.blank].get(direction)
+        if target is None:
+            return None
+        return PackedBoard(slide(self.state, self.blank, target), self.size, target)
+
+    def copy(self) -> "PackedBoard":
+        return PackedBoard(self.state, self.size, self.blank)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedBoard):
+            return self.state == other.state and self.size == other.size
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.state)
+
+    def __repr__(self) -> str:
+        return f"PackedBoard({self.rows()!r})"
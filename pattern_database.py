@@ -0,0 +1,285 @@
+import os
+import sys
+from collections import deque
+import numpy as np
+
+# Disjoint tile groups per board size; the tables of one partition can be added together
+PATTERNS = {
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 6, 7, 11, 12), (3, 4, 5, 8, 9, 10), (13, 14, 15, 18, 19, 20), (16, 17, 21, 22, 23, 24)),
+}
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")
+UNSEEN = 255
+CHUNK = 1 << 20  # States expanded per vectorized step, bounds peak memory on large boards
+
+
+def table_size(cells: int, tiles: int) -> int:
+    """
+    Count the ways of placing some distinct tiles on a board.
+
+    Args:
+        cells (int): Number of cells on the board.
+        tiles (int): Number of tiles placed.
+
+    Returns:
+        int: cells! / (cells - tiles)!
+    """
+    count = 1
+    for i in range(tiles):
+        count *= cells - i
+    return count
+
+
+def rank_positions(positions, cells: int) -> int:
+    """
+    Rank the cells occupied by a pattern's tiles, in pattern order.
+
+    Args:
+        positions: Cell index of every tile of the pattern.
+        cells (int): Number of cells on the board.
+
+    Returns:
+        int: Index into the pattern's table.
+    """
+    rank = 0
+    for i, pos in enumerate(positions):
+        smaller = 0
+        for previous in positions[:i]:
+            if previous < pos:
+                smaller += 1
+        rank = rank * (cells - i) + pos - smaller
+    return rank
+
+
+def _rank_rows(positions: np.ndarray, cells: int) -> np.ndarray:
+    """Vectorized rank_positions over the rows of an (m, k) array."""
+    rank = np.zeros(len(positions), dtype=np.int64)
+    for i in range(positions.shape[1]):
+        column = positions[:, i:i + 1]
+        smaller = (positions[:, :i] < column).sum(axis=1)
+        rank = rank * (cells - i) + column[:, 0] - smaller
+    return rank
+
+
+def _expand(states: np.ndarray, size: int, pattern_moves: bool) -> np.ndarray:
+    """
+    Generate the successors of (pattern positions..., blank) states.
+
+    Args:
+        states (np.ndarray): (m, k + 1) array, blank position in the last column.
+        size (int): Size of the board (n x n).
+        pattern_moves (bool): True for moves that slide a pattern tile, False for the free ones.
+
+    Returns:
+        np.ndarray: Successor states, possibly with duplicates.
+    """
+    blank = states[:, -1]
+    row, col = blank // size, blank % size
+    successors = []
+    for d_row, d_col, inside in ((-1, 0, row > 0), (1, 0, row < size - 1),
+                                 (0, -1, col > 0), (0, 1, col < size - 1)):
+        target = blank + d_row * size + d_col
+        hits = states[:, :-1] == target[:, None]
+        selected = inside & (hits.any(axis=1) == pattern_moves)
+        moved = states[selected]
+        if pattern_moves:
+            moved[:, :-1][hits[selected]] = blank[selected]
+        moved[:, -1] = target[selected]
+        successors.append(moved)
+    return np.concatenate(successors)
+
+
+def _visit(states: np.ndarray, visited: np.ndarray, cells: int) -> np.ndarray:
+    """Keep the states not seen before, without duplicates, and mark them as seen."""
+    ranks = _rank_rows(states, cells)
+    fresh = (visited[ranks >> 3] >> (ranks & 7).astype(np.uint8)) & 1 == 0
+    ranks, first = np.unique(ranks[fresh], return_index=True)
+    np.bitwise_or.at(visited, ranks >> 3, (1 << (ranks & 7)).astype(np.uint8))
+    return states[fresh][first]
+
+
+def build_pattern_database(size: int, pattern: tuple) -> np.ndarray:
+    """
+    Build the additive pattern database of a tile group by 0-1 breadth-first search.
+
+    Only moves of the group's own tiles are counted, so tables of disjoint groups can be
+    summed into an admissible heuristic. The search runs over (tile positions, blank)
+    states in vectorized chunks and keeps the minimum over blank positions.
+
+    Args:
+        size (int): Size of the board (n x n).
+        pattern (tuple): Tiles of the group.
+
+    Returns:
+        np.ndarray: uint8 table indexed by rank_positions of the group's cells.
+    """
+    cells = size * size
+    tiles = len(pattern)
+    table = np.full(table_size(cells, tiles), UNSEEN, dtype=np.uint8)
+    visited = np.zeros((table_size(cells, tiles + 1) + 7) // 8, dtype=np.uint8)
+    frontier = _visit(np.array([[tile - 1 for tile in pattern] + [cells - 1]], dtype=np.int8), visited, cells)
+    distance = 0
+    while len(frontier):
+        layer = [frontier]
+        pending = [frontier]
+        while pending:
+            states = pending.pop()
+            for start in range(0, len(states), CHUNK):
+                reached = _visit(_expand(states[start:start + CHUNK], size, False), visited, cells)
+                if len(reached):
+                    layer.append(reached)
+                    pending.append(reached)
+        successors = []
+        for states in layer:
+            ranks = _rank_rows(states[:, :-1], cells)
+            table[ranks[table[ranks] == UNSEEN]] = distance
+            for start in range(0, len(states), CHUNK):
+                successors.append(_visit(_expand(states[start:start + CHUNK], size, True), visited, cells))
+        frontier = np.concatenate(successors)
+        distance += 1
+    return table
+
+
+def reference_table(size: int, pattern: tuple) -> np.ndarray:
+    """
+    Build the same table as build_pattern_database with a plain one-state-at-a-time 0-1
+    breadth-first search. Only practical for groups of a few tiles; used to check the
+    vectorized builder.
+
+    Args:
+        size (int): Size of the board (n x n).
+        pattern (tuple): Tiles of the group.
+
+    Returns:
+        np.ndarray: uint8 table indexed by rank_positions of the group's cells.
+    """
+    cells = size * size
+    table = np.full(table_size(cells, len(pattern)), UNSEEN, dtype=np.uint8)
+    start = (tuple(tile - 1 for tile in pattern), cells - 1)
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        positions, blank = state
+        distance = distances[state]
+        rank = rank_positions(positions, cells)
+        table[rank] = min(table[rank], distance)
+        row, col = divmod(blank, size)
+        for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            if not (0 <= row + d_row < size and 0 <= col + d_col < size):
+                continue
+            target = blank + d_row * size + d_col
+            cost = int(target in positions)
+            successor = (tuple(blank if pos == target else pos for pos in positions), target)
+            if distances.get(successor, sys.maxsize) > distance + cost:
+                distances[successor] = distance + cost
+                # Free moves go to the front, so states leave the queue in order of distance
+                if cost:
+                    queue.append(successor)
+                else:
+                    queue.appendleft(successor)
+    return table
+
+
+def check_pattern_database(size: int, pattern: tuple) -> None:
+    """
+    Compare build_pattern_database with reference_table for a small group.
+
+    Args:
+        size (int): Size of the board (n x n).
+        pattern (tuple): Tiles of the group, a few at most.
+
+    Raises:
+        ValueError: If the two tables differ.
+    """
+    built, expected = build_pattern_database(size, pattern), reference_table(size, pattern)
+    wrong = np.flatnonzero(built != expected)
+    if len(wrong):
+        raise ValueError(f"{size}x{size} table of {pattern} differs from the reference at {len(wrong)} "
+                         f"of {len(expected)} entries, first at rank {wrong[0]}")
+
+
+def database_path(size: int, pattern: tuple, directory: str = DEFAULT_DIRECTORY) -> str:
+    """
+    Name the file holding a pattern database.
+
+    Args:
+        size (int): Size of the board (n x n).
+        pattern (tuple): Tiles of the group.
+        directory (str): Directory holding the tables.
+
+    Returns:
+        str: Path of the table file.
+    """
+    return os.path.join(directory, "pdb_{}x{}_{}.bin".format(size, size, "-".join(map(str, pattern))))
+
+
+def save_pattern_database(table: np.ndarray, path: str) -> None:
+    """
+    Write a pattern database to disk as raw bytes.
+
+    Args:
+        table (np.ndarray): Table returned by build_pattern_database.
+        path (str): Destination file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.asarray(table, dtype=np.uint8).tofile(path)
+
+
+def load_pattern_databases(size: int, directory: str = DEFAULT_DIRECTORY, patterns: tuple = None):
+    """
+    Memory-map the pattern databases of a partition.
+
+    The tables are opened read-only, so every process mapping the same files shares one
+    copy through the page cache.
+
+    Args:
+        size (int): Size of the board (n x n).
+        directory (str): Directory holding the tables.
+        patterns (tuple): Partition to load; defaults to PATTERNS[size].
+
+    Returns:
+        list or None: (pattern, table) pairs, or None if any table file is missing.
+    """
+    if patterns is None:
+        patterns = PATTERNS.get(size)
+    if not patterns:
+        return None
+    databases = []
+    for pattern in patterns:
+        path = database_path(size, pattern, directory)
+        if not os.path.exists(path):
+            return None
+        shape = (table_size(size * size, len(pattern)),)
+        databases.append((pattern, np.memmap(path, dtype=np.uint8, mode="r", shape=shape)))
+    return databases
+
+
+def build_all(size: int, directory: str = DEFAULT_DIRECTORY, patterns: tuple = None) -> None:
+    """
+    Build and save every missing table of a partition.
+
+    Args:
+        size (int): Size of the board (n x n).
+        directory (str): Directory holding the tables.
+        patterns (tuple): Partition to build; defaults to PATTERNS[size].
+    """
+    for pattern in patterns or PATTERNS[size]:
+        path = database_path(size, pattern, directory)
+        if os.path.exists(path):
+            continue
+        print("Building {}".format(path))
+        save_pattern_database(build_pattern_database(size, pattern), path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python pattern_database.py SIZE [DIRECTORY]")
+        print("       python pattern_database.py check SIZE TILE...")
+        sys.exit(1)
+    if sys.argv[1] == "check":
+        check_pattern_database(int(sys.argv[2]), tuple(int(tile) for tile in sys.argv[3:]))
+        print("ok")
+        sys.exit(0)
+    build_all(int(sys.argv[1]), sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DIRECTORY)
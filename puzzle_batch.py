@@ -0,0 +1,102 @@
+import sys
+import numpy as np
+
+CHUNK = 1 << 16  # Boards generated per vectorized step
+MAX_SIZE = 16  # Largest board whose tiles fit in uint8
+
+
+def _solvable_rows(boards: np.ndarray, size: int) -> np.ndarray:
+    """
+    Apply the AS2 solvability rule to every row of a batch of flattened boards.
+
+    Args:
+        boards (np.ndarray): (k, n * n) array of boards.
+        size (int): Size of the puzzles (n x n).
+
+    Returns:
+        np.ndarray: Boolean array of length k.
+    """
+    parity = np.zeros(len(boards), dtype=np.uint8)
+    for i in range(boards.shape[1] - 1):
+        tile = boards[:, i:i + 1]
+        parity ^= ((boards[:, i + 1:] < tile) & (boards[:, i + 1:] != 0)).sum(axis=1, dtype=np.uint8) & 1
+    if size % 2 == 0:
+        empty_row = np.argmax(boards == 0, axis=1) // size
+        return (parity + empty_row) % 2 == 1
+    return parity == 0
+
+
+def _generate_chunk(count: int, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generate flattened solvable boards, fixing parity by swapping the first two non-empty tiles.
+
+    Args:
+        count (int): Number of boards.
+        size (int): Size of the puzzles (n x n).
+        rng (np.random.Generator): Source of randomness.
+
+    Returns:
+        np.ndarray: (count, n * n) uint8 array.
+    """
+    boards = np.argsort(rng.random((count, size * size)), axis=1).astype(np.uint8)
+    rows = np.flatnonzero(~_solvable_rows(boards, size))
+    empty = np.argmax(boards[rows] == 0, axis=1)
+    first = (empty == 0).astype(np.intp)
+    second = first + 1 + (empty == first + 1)
+    boards[rows, first], boards[rows, second] = boards[rows, second], boards[rows, first]
+    return boards
+
+
+def _chunks(count: int, size: int, seed):
+    """Yield (k, n, n) chunks of solvable boards that together form the seeded batch."""
+    if not 2 <= size <= MAX_SIZE:
+        raise ValueError(f"size must be between 2 and {MAX_SIZE}, got {size}")
+    rng = np.random.default_rng(seed)
+    for start in range(0, count, CHUNK):
+        yield _generate_chunk(min(CHUNK, count - start), size, rng).reshape((-1, size, size))
+
+
+def generate_batch(count: int, size: int, seed=None) -> np.ndarray:
+    """
+    Generate many random, but solvable, puzzles at once.
+
+    Args:
+        count (int): Number of puzzles.
+        size (int): Size of the puzzles (n x n).
+        seed: Seed for np.random.default_rng; the same seed always gives the same batch.
+
+    Returns:
+        np.ndarray: (count, n, n) uint8 array of puzzles in the layout of generate_puzzle.
+    """
+    chunks = list(_chunks(count, size, seed))
+    if not chunks:
+        return np.zeros((0, size, size), dtype=np.uint8)
+    return np.concatenate(chunks)
+
+
+def write_batch(path: str, count: int, size: int, seed=None) -> None:
+    """
+    Stream a batch of puzzles into a .npy file one chunk at a time.
+
+    The file holds the same array generate_batch would return for the same arguments,
+    but only one chunk is ever held in memory.
+
+    Args:
+        path (str): Destination .npy file.
+        count (int): Number of puzzles.
+        size (int): Size of the puzzles (n x n).
+        seed: Seed for np.random.default_rng.
+    """
+    header = {"descr": np.lib.format.dtype_to_descr(np.dtype(np.uint8)),
+              "fortran_order": False, "shape": (count, size, size)}
+    with open(path, "wb") as f:
+        np.lib.format.write_array_header_1_0(f, header)
+        for chunk in _chunks(count, size, seed):
+            f.write(chunk.tobytes())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python puzzle_batch.py COUNT SIZE PATH [SEED]")
+        sys.exit(1)
+    write_batch(sys.argv[3], int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[4]) if len(sys.argv) > 4 else None)
@@ -0,0 +1,240 @@
+import numpy as np
+
+# Blank moves as (name, row offset, column offset), named like the solvers' moves
+MOVES = (("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1))
+OFFSETS = {name: (d_row, d_col) for name, d_row, d_col in MOVES}
+
+
+class SolverTimeout(Exception):
+    """Raised when a search runs past its time limit."""
+
+    def __init__(self, nodes: int):
+        super().__init__(f"time limit reached after {nodes} nodes")
+        self.nodes = nodes
+
+
+def shuffle_puzzle(local_puzzle: np.ndarray) -> np.ndarray:
+    """
+    Shuffle the puzzle into a solvable configuration in a single pass.
+
+    If the shuffle lands on an unsolvable configuration, swapping two non-empty tiles
+    flips the inversion parity without moving the empty tile, which makes it solvable.
+
+    Args:
+        local_puzzle (np.ndarray): Initial puzzle configuration.
+
+    Returns:
+        np.ndarray: A solvable puzzle configuration.
+    """
+    size = len(local_puzzle)
+    puzzle_flat = local_puzzle.flatten()
+    np.random.shuffle(puzzle_flat)
+    if not is_solvable(puzzle_flat.reshape((size, size))):
+        first, second = np.flatnonzero(puzzle_flat)[:2]
+        puzzle_flat[first], puzzle_flat[second] = puzzle_flat[second], puzzle_flat[first]
+    return puzzle_flat.reshape((size, size))
+
+
+def count_inversions(tiles: list) -> int:
+    """
+    Count the pairs of tiles that appear in the wrong order, using a Fenwick tree.
+
+    Args:
+        tiles (list): Distinct tile numbers from 1 to len(tiles), in board order.
+
+    Returns:
+        int: Number of inversions.
+    """
+    tree = [0] * (len(tiles) + 1)
+    inversion_count = 0
+    for seen, tile in enumerate(tiles):
+        # Tiles seen so far that are not greater than this one
+        i = tile
+        not_greater = 0
+        while i > 0:
+            not_greater += tree[i]
+            i -= i & -i
+        inversion_count += seen - not_greater
+        i = tile
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return inversion_count
+
+
+def is_solvable(local_puzzle: np.ndarray) -> bool:
+    """
+    Determine whether a puzzle configuration is solvable.
+
+    Args:
+        local_puzzle (np.ndarray): Puzzle configuration to check.
+
+    Returns:
+        bool: True if solvable, False otherwise.
+    """
+    puzzle_flat = local_puzzle.flatten()
+    inversion_count = count_inversions(puzzle_flat[puzzle_flat != 0].tolist())
+    empty_row = np.where(local_puzzle == 0)[0][0]
+    if len(local_puzzle) % 2 == 0:
+        return (inversion_count + empty_row) % 2 == 1
+    else:
+        return inversion_count % 2 == 0
+
+
+def generate_puzzle(s: int) -> np.ndarray:
+    """
+    Generate a random, but solvable, puzzle of a given size.
+
+    Args:
+        s (int): Size of the puzzle (n x n).
+
+    Returns:
+        np.ndarray: Generated solvable puzzle.
+    """
+    temp_puzzle = np.arange(1, s**2 + 1) % (s**2)
+    temp_puzzle = temp_puzzle.reshape((s, s))
+    return shuffle_puzzle(temp_puzzle)
+
+
+def line_conflicts(goal_indices: list) -> int:
+    """
+    Count the linear-conflict penalty for the tiles that belong to one line.
+
+    Args:
+        goal_indices (list): Goal positions along the line of the tiles already in it, in board order.
+
+    Returns:
+        int: Twice the number of tiles that must leave the line so the rest are in order.
+    """
+    longest = []
+    for value in goal_indices:
+        for i, tail in enumerate(longest):
+            if value < tail:
+                longest[i] = value
+                break
+        else:
+            longest.append(value)
+    return 2 * (len(goal_indices) - len(longest))
+
+
+class PuzzleBoard:
+    """
+    An n x n sliding puzzle that owns its tiles and keeps track of the empty cell.
+
+    Moves are named after the direction the empty cell travels ('up', 'down', 'left',
+    'right'), so a solver's output can be applied directly.
+
+    The number of misplaced tiles, the Manhattan distance and the linear-conflict score
+    are kept up to date on every move, so checking for a win is O(1) and a move costs O(n)
+    (only the two lines the tile leaves and enters are rescored).
+    """
+
+    def __init__(self, tiles: np.ndarray):
+        """
+        Args:
+            tiles (np.ndarray): n x n configuration with 0 for the empty cell; it is copied.
+        """
+        self.tiles = np.array(tiles)
+        self.size = len(self.tiles)
+        if self.tiles.shape != (self.size, self.size):
+            raise ValueError(f"expected a square puzzle, got shape {self.tiles.shape}")
+        empty = np.flatnonzero(self.tiles.ravel() == 0)
+        if len(empty) != 1:
+            raise ValueError("the puzzle needs exactly one empty cell")
+        self.blank = divmod(int(empty[0]), self.size)
+        self.misplaced = 0  # Tiles not on their goal cell, the empty cell excluded
+        self.manhattan = 0  # Sum of the tiles' distances to their goal cells
+        for (row, col), tile in np.ndenumerate(self.tiles):
+            if tile:
+                goal_row, goal_col = divmod(int(tile) - 1, self.size)
+                self.misplaced += (row, col) != (goal_row, goal_col)
+                self.manhattan += abs(row - goal_row) + abs(col - goal_col)
+        self.row_conflicts = [self._row_conflict(row) for row in range(self.size)]
+        self.col_conflicts = [self._col_conflict(col) for col in range(self.size)]
+        self.conflicts = sum(self.row_conflicts) + sum(self.col_conflicts)
+
+    def _row_conflict(self, row: int) -> int:
+        size = self.size
+        return line_conflicts([(tile - 1) % size for tile in self.tiles[row].tolist()
+                               if tile and (tile - 1) // size == row])
+
+    def _col_conflict(self, col: int) -> int:
+        size = self.size
+        return line_conflicts([(tile - 1) // size for tile in self.tiles[:, col].tolist()
+                               if tile and (tile - 1) % size == col])
+
+    @property
+    def heuristic(self) -> int:
+        """
+        Manhattan distance plus linear conflict: a lower bound on the moves left.
+        """
+        return self.manhattan + self.conflicts
+
+    def legal_moves(self) -> list:
+        """
+        Returns:
+            list: Names of the moves the empty cell can make.
+        """
+        row, col = self.blank
+        return [name for name, d_row, d_col in MOVES
+                if 0 <= row + d_row < self.size and 0 <= col + d_col < self.size]
+
+    def move_for(self, row: int, col: int):
+        """
+        Find the move that slides the tile in a cell into the empty cell.
+
+        Args:
+            row (int): Row of the tile.
+            col (int): Column of the tile.
+
+        Returns:
+            str or None: The move, or None if the cell is not next to the empty cell.
+        """
+        empty_row, empty_col = self.blank
+        for name, d_row, d_col in MOVES:
+            if (empty_row + d_row, empty_col + d_col) == (row, col):
+                return name
+        return None
+
+    def apply(self, move: str) -> tuple:
+        """
+        Make a move.
+
+        Args:
+            move (str): 'up', 'down', 'left' or 'right'.
+
+        Returns:
+            tuple: The two cells that changed, (row, col) of the tile's old cell first.
+
+        Raises:
+            ValueError: If the move would leave the board.
+        """
+        d_row, d_col = OFFSETS[move]
+        row, col = self.blank
+        target = (row + d_row, col + d_col)
+        if not (0 <= target[0] < self.size and 0 <= target[1] < self.size):
+            raise ValueError(f"cannot move {move} from {self.blank}")
+        tile = int(self.tiles[target])
+        self.tiles[row, col], self.tiles[target] = tile, 0
+        self.blank = target
+        goal = divmod(tile - 1, self.size)
+        before = abs(target[0] - goal[0]) + abs(target[1] - goal[1])
+        after = abs(row - goal[0]) + abs(col - goal[1])
+        self.manhattan += after - before
+        self.misplaced += (target == goal) - ((row, col) == goal)
+        # The tile changes lines across the move only; the line along the move keeps its order
+        if d_row:
+            lines, first, second, score = self.row_conflicts, row, target[0], self._row_conflict
+        else:
+            lines, first, second, score = self.col_conflicts, col, target[1], self._col_conflict
+        old = lines[first] + lines[second]
+        lines[first], lines[second] = score(first), score(second)
+        self.conflicts += lines[first] + lines[second] - old
+        return target, (row, col)
+
+    def is_solved(self) -> bool:
+        """
+        Returns:
+            bool: True if the tiles are in order with the empty cell last.
+        """
+        return self.misplaced == 0
@@ -0,0 +1,214 @@
+import json
+import random
+import sys
+import time
+
+from packed_board import DIRECTIONS, PackedBoard
+
+GOAL = PackedBoard.from_rows(((1, 0, 8), (2, 7, 3), (6, 5, 4)))  # Goal of the AS1 text puzzle
+
+
+def validate_keys(keys: str) -> str:
+    """
+    Check the 4 letters chosen for the left, right, up and down moves.
+
+    Parameters:
+    keys (str) -> The letters as typed, case insensitive, spaces ignored.
+
+    Returns:
+    str -> The normalized letters.
+
+    Raises:
+    ValueError -> With the message shown to the player when the letters are not usable.
+    """
+    keys = keys.lower().replace(" ", "")
+    if not keys.isalpha():
+        raise ValueError("Invalid input. Please use only alphabetical characters.")
+    if len(keys) != 4:
+        raise ValueError("Invalid input. Please enter exactly 4 letters.")
+    if len(set(keys)) != 4:
+        raise ValueError("Invalid input. Please ensure all 4 letters are unique.")
+    return keys
+
+
+def scrambled_board(rng: random.Random = random, steps: int = 100) -> PackedBoard:
+    """
+    Scramble the goal with random moves, which always gives a solvable board.
+
+    Parameters:
+    rng (random.Random) -> Source of randomness.
+    steps (int) -> Number of random moves.
+
+    Returns:
+    PackedBoard -> The scrambled board.
+    """
+    board = GOAL.copy()
+    for _ in range(steps):
+        board.move(rng.choice(board.legal_moves()))
+    return board
+
+
+class PuzzleSession:
+    """
+    The rules of the AS1 puzzle for one game, without any terminal input or output.
+    """
+
+    def __init__(self, keys: str, puzzle, goal: PackedBoard = GOAL, recorder=None):
+        """
+        Parameters:
+        keys (str) -> The 4 letters for left, right, up and down moves.
+        puzzle -> The starting board, as a PackedBoard or a 2D list.
+        goal (PackedBoard) -> The board that wins the game.
+        recorder (SessionRecorder) -> Log that the game's moves are appended to, if any.
+        """
+        self.keys = validate_keys(keys)
+        self.directions = dict(zip(self.keys, DIRECTIONS))
+        self.board = puzzle.copy() if isinstance(puzzle, PackedBoard) else PackedBoard.from_rows(puzzle)
+        self.goal = goal
+        self.total_moves = 0
+        self.invalid_moves = 0
+        self.recorder = recorder
+        self.session_id = recorder.start(self.board.rows()) if recorder else None
+
+    @property
+    def solved(self) -> bool:
+        return self.board == self.goal
+
+    def valid_moves(self) -> tuple:
+        """
+        Get the moves allowed by the current position of the empty tile.
+
+        Returns:
+        tuple -> A list of prompts such as 'l-left' and the list of matching letters.
+        """
+        legal = self.board.legal_moves()
+        letters = [self.keys[DIRECTIONS.index(direction)] for direction in legal]
+        prompts = ["{}-{}".format(letter, direction) for letter, direction in zip(letters, legal)]
+        return prompts, letters
+
+    def press(self, key: str) -> bool:
+        """
+        Apply one key press.
+
+        Parameters:
+        key (str) -> The letter entered by the player.
+
+        Returns:
+        bool -> True if the key was a legal move and the board changed.
+        """
+        direction = self.directions.get(key.lower())
+        if direction is not None and self.board.move(direction):
+            self.total_moves += 1
+            if self.recorder:
+                self.recorder.record(self.session_id, direction)
+            return True
+        self.invalid_moves += 1
+        return False
+
+    def play(self, presses: str) -> bool:
+        """
+        Apply a stream of key presses, stopping once the puzzle is solved.
+
+        Parameters:
+        presses (str) -> The letters entered by the player, in order.
+
+        Returns:
+        bool -> True if the puzzle ended up solved.
+        """
+        for key in presses:
+            if self.solved:
+                break
+            self.press(key)
+        return self.solved
+
+
+def parse_session(line: str) -> tuple:
+    """
+    Parse one scripted session: the board, the move letters and the key presses.
+
+    The board is written as 9 digits in row-major order with 0 for the empty tile,
+    e.g. '120873654 lrud ddlr'. The key presses may be omitted.
+
+    Parameters:
+    line (str) -> The session line.
+
+    Returns:
+    tuple -> The board as a 2D list, the move letters and the key presses.
+    """
+    fields = line.split()
+    if len(fields) < 2 or len(fields[0]) != 9 or sorted(fields[0]) != list("012345678"):
+        raise ValueError("expected 'BOARD KEYS [PRESSES]' with a 9-digit board, got {!r}".format(line))
+    tiles = [int(digit) for digit in fields[0]]
+    return [tiles[0:3], tiles[3:6], tiles[6:9]], fields[1], "".join(fields[2:])
+
+
+def replay_sessions(lines, output) -> dict:
+    """
+    Replay many scripted sessions in one process and report the results.
+
+    One JSON line is written per session; blank lines and lines starting with '#' are skipped.
+
+    Parameters:
+    lines -> Iterable of session lines.
+    output -> Text stream receiving the per-session results.
+
+    Returns:
+    dict -> Totals: sessions, solved sessions, key presses, seconds and moves per second.
+    """
+    sessions = solved = presses = 0
+    elapsed = 0.0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        result = {"line": number}
+        try:
+            puzzle, keys, keys_pressed = parse_session(line)
+            started = time.perf_counter()
+            session = PuzzleSession(keys, puzzle)
+            session.play(keys_pressed)
+            elapsed += time.perf_counter() - started
+        except ValueError as error:
+            result.update(error=str(error))
+        else:
+            sessions += 1
+            solved += session.solved
+            presses += session.total_moves + session.invalid_moves
+            result.update(solved=session.solved, total_moves=session.total_moves,
+                          invalid_moves=session.invalid_moves, board=session.board.rows())
+        output.write(json.dumps(result) + "\n")
+    return {"sessions": sessions, "solved": solved, "presses": presses, "seconds": elapsed,
+            "moves_per_second": presses / elapsed if elapsed else 0.0}
+
+
+def main(paths: list) -> int:
+    """
+    Replay session files (or standard input when no file or '-' is given).
+
+    Parameters:
+    paths (list) -> Files with one session per line.
+
+    Returns:
+    int -> Exit status.
+    """
+    totals = None
+    for path in paths or ["-"]:
+        lines = sys.stdin if path == "-" else open(path)
+        try:
+            result = replay_sessions(lines, sys.stdout)
+        finally:
+            if lines is not sys.stdin:
+                lines.close()
+        if totals is None:
+            totals = result
+        else:
+            for key in ("sessions", "solved", "presses", "seconds"):
+                totals[key] += result[key]
+    totals["moves_per_second"] = totals["presses"] / totals["seconds"] if totals["seconds"] else 0.0
+    print("{sessions} sessions, {solved} solved, {presses} key presses in {seconds:.3f}s "
+          "({moves_per_second:.0f} moves/sec)".format(**totals), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,263 @@
+import turtle
+import numpy as np
+
+TILE_SIZE = 80
+GAP = 5  # Space between tiles
+MAX_EXTENT = 720  # Largest board width in pixels before tiles are scaled down
+FONT_NAME = "Arial"
+FONT_SIZE = 18  # Font size for TILE_SIZE tiles, scaled with the tiles
+
+
+def tile_metrics(size: int, max_extent: int = MAX_EXTENT) -> tuple:
+    """
+    Choose the tile size and gap for a board, shrinking tiles on large boards.
+
+    Args:
+        size (int): Size of the puzzle (n x n).
+        max_extent (int): Largest board width in pixels.
+
+    Returns:
+        tuple: (tile size, gap) in pixels.
+    """
+    if size * (TILE_SIZE + GAP) - GAP <= max_extent:
+        return TILE_SIZE, GAP
+    pitch = max_extent // size
+    gap = max(1, pitch // 17)
+    return pitch - gap, gap
+
+
+def tile_origin(size: int, col: float, row: float, tile_size: int = TILE_SIZE, gap: int = GAP) -> tuple:
+    """
+    Compute the top-left corner of a tile in turtle coordinates.
+
+    Args:
+        size (int): Size of the puzzle (n x n).
+        col (float): Column of the tile; fractional values are used while animating.
+        row (float): Row of the tile.
+        tile_size (int): Side of a tile in pixels.
+        gap (int): Space between tiles in pixels.
+
+    Returns:
+        tuple: (x, y) of the corner, with y growing upwards.
+    """
+    extent = size * tile_size + (size - 1) * gap
+    return col * (tile_size + gap) - extent / 2, extent / 2 - row * (tile_size + gap)
+
+
+def cell_at(size: int, x: float, y: float, tile_size: int = TILE_SIZE, gap: int = GAP):
+    """
+    Find the cell under a point given in turtle coordinates.
+
+    Args:
+        size (int): Size of the puzzle (n x n).
+        x (float): X-coordinate of the point.
+        y (float): Y-coordinate of the point.
+        tile_size (int): Side of a tile in pixels.
+        gap (int): Space between tiles in pixels.
+
+    Returns:
+        tuple or None: (row, col) of the cell, or None outside the board.
+    """
+    extent = size * tile_size + (size - 1) * gap
+    col = int((x + extent / 2) // (tile_size + gap))
+    row = int((extent / 2 - y) // (tile_size + gap))
+    if 0 <= row < size and 0 <= col < size:
+        return row, col
+    return None
+
+
+def tile_font(tile_size: int) -> tuple:
+    """
+    Returns:
+        tuple: Tk font for the numbers on tiles of the given size.
+    """
+    return FONT_NAME, max(6, FONT_SIZE * tile_size // TILE_SIZE), "normal"
+
+
+class CanvasTileRenderer:
+    """
+    Draws the puzzle with one persistent rectangle and one text item per cell of the Tk canvas.
+
+    Items are created once; afterwards only the cells that changed are reconfigured, so a move
+    costs the same on any board size and the canvas never accumulates items.
+    """
+
+    def __init__(self, screen, size: int, tile_color: str, empty_color: str, text_color: str,
+                 tile_size: int = TILE_SIZE, gap: int = GAP):
+        """
+        Args:
+            screen: The turtle screen to draw on.
+            size (int): Size of the puzzle (n x n).
+            tile_color (str): Fill of the numbered tiles.
+            empty_color (str): Fill of the empty cell.
+            text_color (str): Colour of the numbers.
+            tile_size (int): Side of a tile in pixels.
+            gap (int): Space between tiles in pixels.
+        """
+        self.canvas = screen.getcanvas()
+        self.size = size
+        self.tile_color = tile_color
+        self.empty_color = empty_color
+        self.text_color = text_color
+        self.tile_size = tile_size
+        self.gap = gap
+        font = tile_font(tile_size)
+        self.items = {}  # (row, col) -> (rectangle id, text id)
+        for row in range(size):
+            for col in range(size):
+                rectangle = self.canvas.create_rectangle(0, 0, 0, 0, outline="")
+                text = self.canvas.create_text(0, 0, text="", anchor="s", fill=text_color, font=font)
+                self.items[row, col] = (rectangle, text)
+                self.place(row, col, col, row)
+
+    def place(self, row: int, col: int, x_col: float, y_row: float) -> None:
+        """
+        Move the items of a cell to a grid position, which may be fractional while animating.
+
+        Args:
+            row (int): Row of the cell whose items move.
+            col (int): Column of the cell whose items move.
+            x_col (float): Column to draw them at.
+            y_row (float): Row to draw them at.
+        """
+        rectangle, text = self.items[row, col]
+        x, y = tile_origin(self.size, x_col, y_row, self.tile_size, self.gap)
+        # Tk's y axis points down, the turtle's points up
+        self.canvas.coords(rectangle, x, -y, x + self.tile_size, -y + self.tile_size)
+        self.canvas.coords(text, x + self.tile_size / 2 - 1, -y + self.tile_size * 45 / 80)
+        self.canvas.tag_raise(rectangle)
+        self.canvas.tag_raise(text)
+
+    def hide_number(self, row: int, col: int) -> None:
+        """
+        Hide the number of a cell until it is next updated, e.g. while its tile moves.
+        """
+        self.canvas.itemconfigure(self.items[row, col][1], state="hidden")
+
+    def update(self, puzzle: np.ndarray, cells: list) -> None:
+        """
+        Refresh the listed cells from the puzzle and put their items back on the grid.
+
+        Args:
+            puzzle (np.ndarray): Current puzzle state.
+            cells (list): (row, col) pairs that changed.
+        """
+        for row, col in cells:
+            number = int(puzzle[row, col])
+            rectangle, text = self.items[row, col]
+            self.canvas.itemconfigure(rectangle, fill=self.tile_color if number else self.empty_color)
+            self.canvas.itemconfigure(text, text=str(number) if number else "", fill=self.text_color, state="normal")
+            self.place(row, col, col, row)
+
+    def draw(self, puzzle: np.ndarray) -> None:
+        """
+        Refresh every cell, e.g. after the colours change.
+
+        Args:
+            puzzle (np.ndarray): Current puzzle state.
+        """
+        self.update(puzzle, list(self.items))
+
+
+class ShapeTileRenderer:
+    """
+    Draws each tile as a turtle wearing a square shape registered once per tile size.
+
+    The number of every tile is a text item created once and moved along with its turtle, so
+    a move only relocates the two tiles involved. The empty cell is left to the background.
+    """
+
+    def __init__(self, screen, size: int, tile_color: str, empty_color: str, text_color: str,
+                 tile_size: int = TILE_SIZE, gap: int = GAP):
+        """
+        Args:
+            screen: The turtle screen to draw on.
+            size (int): Size of the puzzle (n x n).
+            tile_color (str): Fill of the numbered tiles.
+            empty_color (str): Fill of the empty cell (the screen background shows through).
+            text_color (str): Colour of the numbers.
+            tile_size (int): Side of a tile in pixels.
+            gap (int): Space between tiles in pixels.
+        """
+        self.canvas = screen.getcanvas()
+        self.size = size
+        self.tile_color = tile_color
+        self.empty_color = empty_color
+        self.text_color = text_color
+        self.tile_size = tile_size
+        self.gap = gap
+        shape = "tile{}".format(tile_size)
+        if shape not in screen.getshapes():
+            half = tile_size / 2
+            screen.register_shape(shape, ((-half, -half), (-half, half), (half, half), (half, -half)))
+        font = tile_font(tile_size)
+        self.tiles = {}  # number -> turtle
+        self.glyphs = {}  # number -> text id
+        self.colors = {}  # number -> fill the turtle was last given
+        for number in range(1, size * size):
+            tile = turtle.RawTurtle(screen, shape=shape, visible=False)
+            tile.penup()
+            tile.speed(0)
+            self.tiles[number] = tile
+            self.glyphs[number] = self.canvas.create_text(0, 0, text=str(number), anchor="s", fill=text_color,
+                                                          font=font, state="hidden")
+        self.cells = {}  # (row, col) -> number drawn there
+
+    def _move(self, number: int, x_col: float, y_row: float) -> None:
+        x, y = tile_origin(self.size, x_col, y_row, self.tile_size, self.gap)
+        half = self.tile_size / 2
+        self.tiles[number].goto(x + half, y - half)
+        self.canvas.coords(self.glyphs[number], x + half - 1, -y + self.tile_size * 45 / 80)
+        self.canvas.tag_raise(self.glyphs[number])
+
+    def place(self, row: int, col: int, x_col: float, y_row: float) -> None:
+        """
+        Move the tile shown in a cell to a grid position, which may be fractional while animating.
+
+        Args:
+            row (int): Row of the cell whose tile moves.
+            col (int): Column of the cell whose tile moves.
+            x_col (float): Column to draw it at.
+            y_row (float): Row to draw it at.
+        """
+        number = self.cells.get((row, col))
+        if number:
+            self._move(number, x_col, y_row)
+
+    def hide_number(self, row: int, col: int) -> None:
+        """
+        Hide the number of a cell until it is next updated, e.g. while its tile moves.
+        """
+        number = self.cells.get((row, col))
+        if number:
+            self.canvas.itemconfigure(self.glyphs[number], state="hidden")
+
+    def update(self, puzzle: np.ndarray, cells: list) -> None:
+        """
+        Refresh the listed cells from the puzzle and put their tiles back on the grid.
+
+        Args:
+            puzzle (np.ndarray): Current puzzle state.
+            cells (list): (row, col) pairs that changed.
+        """
+        for row, col in cells:
+            number = int(puzzle[row, col])
+            self.cells[row, col] = number
+            if not number:
+                continue
+            tile = self.tiles[number]
+            if self.colors.get(number) != self.tile_color:
+                tile.color(self.tile_color)
+                self.colors[number] = self.tile_color
+            self._move(number, col, row)
+            tile.showturtle()
+            self.canvas.itemconfigure(self.glyphs[number], state="normal")
+
+    def draw(self, puzzle: np.ndarray) -> None:
+        """
+        Refresh every cell, e.g. after the colours change.
+
+        Args:
+            puzzle (np.ndarray): Current puzzle state.
+        """
+        self.update(puzzle, [(row, col) for row in range(self.size) for col in range(self.size)])
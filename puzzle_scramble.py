@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+import numpy as np
+
+import puzzle_table
+from puzzle_solver import estimate, scramble, solve
+
+# Optimal-distance bands (inclusive) served for each difficulty tier
+TIERS = {
+    3: {"easy": (4, 12), "medium": (13, 21), "hard": (22, 31)},
+    4: {"easy": (6, 15), "medium": (16, 25), "hard": (26, 35)},
+    5: {"easy": (6, 15), "medium": (16, 25), "hard": (26, 32)},
+}
+
+WALK_SLACK = 6  # Extra random-walk moves, since walks rarely stay optimal
+POOL_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pools")
+
+
+class ScrambleGenerator:
+    """
+    Generates boards at a requested optimal distance from the goal.
+
+    3x3 boards are drawn uniformly from the matching entries of a precomputed distance
+    table, for any goal. Larger boards are random walks from the AS2 goal. A walk's length is
+    an upper bound on the board's optimal length and the solver's heuristic a lower bound, so
+    the solver only runs for boards whose bounds straddle an edge of the band.
+    """
+
+    def __init__(self, size: int, goal=None, seed=None):
+        """
+        Args:
+            size (int): Size of the puzzles (n x n).
+            goal: Goal board as nested rows; only 3x3 boards may use a goal other than AS2's.
+            seed: Seed for np.random.default_rng.
+        """
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.table = None
+        self.candidates = {}
+        if size == 3:
+            goal = puzzle_table.AS2_GOAL if goal is None else tuple(tuple(int(t) for t in row) for row in goal)
+            if goal == puzzle_table.AS1_GOAL:
+                self.table = puzzle_table.get_distance_table()
+            elif goal == puzzle_table.AS2_GOAL:
+                self.table = puzzle_table.get_distance_table(puzzle_table.AS2_TABLE_PATH, goal)
+            else:
+                self.table = puzzle_table.build_distance_table(goal)
+        elif goal is not None:
+            raise ValueError("custom goals are only supported for 3x3 boards")
+
+    def boards(self, count: int, low: int, high: int = None) -> np.ndarray:
+        """
+        Generate boards whose optimal solution length lies in a band.
+
+        Args:
+            count (int): Number of boards.
+            low (int): Smallest accepted distance.
+            high (int): Largest accepted distance; defaults to `low`.
+
+        Returns:
+            np.ndarray: (count, n, n) array of boards.
+
+        Raises:
+            ValueError: If no 3x3 board lies in the band.
+        """
+        if high is None:
+            high = low
+        if self.table is not None:
+            return self._table_boards(count, low, high)
+        return np.array([self._walk_board(low, high) for _ in range(count)]).reshape((count, self.size, self.size))
+
+    def board(self, low: int, high: int = None) -> np.ndarray:
+        """
+        Generate one board whose optimal solution length lies in a band.
+
+        Args:
+            low (int): Smallest accepted distance.
+            high (int): Largest accepted distance; defaults to `low`.
+
+        Returns:
+            np.ndarray: The board.
+        """
+        return self.boards(1, low, high)[0]
+
+    def _table_boards(self, count: int, low: int, high: int) -> np.ndarray:
+        if (low, high) not in self.candidates:
+            self.candidates[low, high] = np.flatnonzero((self.table >= low) & (self.table <= high))
+        candidates = self.candidates[low, high]
+        if not len(candidates):
+            raise ValueError(f"no 3x3 board is between {low} and {high} moves from the goal")
+        ranks = self.rng.choice(candidates, size=count)
+        return np.array([puzzle_table.unrank_state(int(rank)) for rank in ranks]).reshape((count, 3, 3))
+
+    def _walk_board(self, low: int, high: int) -> np.ndarray:
+        while True:
+            steps = int(self.rng.integers(low, high + WALK_SLACK + 1))
+            board = scramble(self.size, steps, self.rng)
+            bound = estimate(board)
+            if bound > high:
+                continue
+            if low <= bound and steps <= high:
+                return board
+            if low <= len(solve(board).moves) <= high:
+                return board
+
+
+def pool_path(size: int, count: int, seed, directory: str = POOL_DIRECTORY) -> str:
+    """
+    Name the file caching the pools filled for a size, pool size and seed.
+
+    Args:
+        size (int): Size of the puzzles (n x n).
+        count (int): Boards per tier.
+        seed: Seed the pools are filled with.
+        directory (str): Directory holding the pool files.
+
+    Returns:
+        str: Path of the pool file.
+    """
+    return os.path.join(directory, "pools_{}x{}_{}_{}.npz".format(size, size, count, seed))
+
+
+def save_pools(pools: dict, size: int, path: str) -> None:
+    """
+    Write pools to disk along with the distance bands of their tiers. They go to a temporary
+    file that is then renamed over the destination, so an interrupted write never leaves a
+    partial file.
+
+    Args:
+        pools (dict): Pools returned by fill_pools.
+        size (int): Size of the puzzles (n x n).
+        path (str): Destination file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        np.savez(file, bands=np.array(list(TIERS[size].values())), **pools)
+    os.replace(temporary, path)
+
+
+def load_pools(path: str, size: int, count: int):
+    """
+    Load pools written by save_pools.
+
+    Args:
+        path (str): File holding the pools.
+        size (int): Size of the puzzles (n x n).
+        count (int): Boards per tier.
+
+    Returns:
+        dict or None: Tier name mapped to a (count, n, n) array of boards, or None if the file
+        is missing, was filled for other bands than TIERS[size] or does not hold count boards
+        of this size for each tier.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        if sorted(data.files) != sorted(["bands", *TIERS[size]]):
+            return None
+        if not np.array_equal(data["bands"], list(TIERS[size].values())):
+            return None
+        pools = {tier: data[tier] for tier in TIERS[size]}
+    if any(boards.shape != (count, size, size) for boards in pools.values()):
+        return None
+    return pools
+
+
+def fill_pools(size: int, count: int, goal=None, seed=None, path: str = None) -> dict:
+    """
+    Pre-fill one pool of boards per difficulty tier.
+
+    Args:
+        size (int): Size of the puzzles (n x n).
+        count (int): Boards per tier.
+        goal: Goal board as nested rows (3x3 only).
+        seed: Seed for np.random.default_rng.
+        path (str): File caching the pools, e.g. pool_path(size, count, seed); they are loaded
+            from it when it holds pools of this size and count, and filled and saved there
+            otherwise. None to always fill them.
+
+    Returns:
+        dict: Tier name mapped to a (count, n, n) array of boards.
+    """
+    if path is not None:
+        pools = load_pools(path, size, count)
+        if pools is not None:
+            return pools
+    generator = ScrambleGenerator(size, goal, seed)
+    pools = {tier: generator.boards(count, low, high) for tier, (low, high) in TIERS[size].items()}
+    if path is not None:
+        save_pools(pools, size, path)
+    return pools
+
+
+if __name__ == "__main__":
+    pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    # 3x3 pools come straight from the distance table; larger ones are kept after the first run
+    path = pool_path(board_size, pool_size, 1002) if board_size > 3 else None
+    started = time.perf_counter()
+    pools = fill_pools(board_size, pool_size, seed=1002, path=path)
+    elapsed = time.perf_counter() - started
+    print("Filled {} tiers of {} {}x{} boards in {:.2f}s".format(
+        len(pools), pool_size, board_size, board_size, elapsed))
@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+import numpy as np
+
+from bidirectional_search import reachable
+from packed_board import pack, PackedBoard
+from puzzle_engine import GOAL, PuzzleSession, scrambled_board, validate_keys
+
+IDLE_TIMEOUT = 300  # Seconds without a line before a session is evicted
+LINE_LIMIT = 256  # Longest accepted line, in bytes
+HELP = "Commands: KEYS <4 letters>, NEW [9-digit board], <move letter>, BOARD, QUIT"
+GOAL_ROWS = np.array(GOAL.rows())
+
+
+def board_digits(board: PackedBoard) -> str:
+    """
+    Write a board as 9 digits in row-major order, 0 being the empty tile.
+    """
+    return "".join(str(tile) for row in board.rows() for tile in row)
+
+
+class ProtocolSession:
+    """
+    Per-connection state machine of the line protocol, independent of any socket.
+
+    A client first picks its move letters with KEYS, then starts games with NEW and
+    plays them one letter per line. Every reply is a single line.
+    """
+
+    def __init__(self, rng: random.Random = random):
+        self.rng = rng
+        self.keys = None
+        self.game = None
+
+    def _state(self) -> str:
+        status = "SOLVED" if self.game.solved else "BOARD"
+        return "{} {} {}".format(status, board_digits(self.game.board), self.game.total_moves)
+
+    def handle(self, line: str) -> tuple:
+        """
+        Process one line from the client.
+
+        Parameters:
+        line (str) -> The line without its line ending.
+
+        Returns:
+        tuple -> The reply line and True if the connection should be closed.
+        """
+        command, _, argument = line.strip().partition(" ")
+        upper = command.upper()
+        if upper == "QUIT":
+            return "BYE", True
+        if upper == "KEYS":
+            try:
+                self.keys = validate_keys(argument)
+            except ValueError as error:
+                return "ERR {}".format(error), False
+            self.game = None
+            return "OK {}".format(self.keys), False
+        if self.keys is None:
+            return "ERR Choose your move letters first. " + HELP, False
+        if upper == "NEW":
+            if argument:
+                if len(argument) != 9 or sorted(argument) != list("012345678"):
+                    return "ERR Expected a 9-digit board.", False
+                board = PackedBoard(pack(int(digit) for digit in argument))
+                if not reachable(np.array(board.rows()), GOAL_ROWS):
+                    return "ERR This board cannot be solved.", False
+            else:
+                board = scrambled_board(self.rng)
+            self.game = PuzzleSession(self.keys, board)
+            return self._state(), False
+        if self.game is None:
+            return "ERR Start a game with NEW. " + HELP, False
+        if upper == "BOARD":
+            return self._state(), False
+        if self.game.solved:
+            return "ERR The puzzle is solved; start another with NEW.", False
+        if len(command) != 1 or argument:
+            return "ERR Unknown command. " + HELP, False
+        if not self.game.press(command):
+            return "ERR Invalid move. Please enter a valid move among the prompt.", False
+        return self._state(), False
+
+
+async def serve_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, idle_timeout: float) -> None:
+    """
+    Run one connection: read a line, answer it, and wait for the socket to drain.
+
+    Waiting on drain() before reading the next line applies back-pressure to clients that
+    do not read their replies, and connections quiet for idle_timeout seconds are closed.
+    """
+    session = ProtocolSession()
+    try:
+        while True:
+            try:
+                data = await asyncio.wait_for(reader.readline(), idle_timeout)
+            except asyncio.TimeoutError:
+                writer.write(b"BYE idle\n")
+                break
+            except ValueError:
+                writer.write(b"ERR Line too long.\n")
+                break
+            if not data:
+                break
+            reply, close = session.handle(data.decode("utf-8", "replace"))
+            writer.write(reply.encode() + b"\n")
+            await writer.drain()
+            if close:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_server(host: str, port: int, idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """
+    Serve the puzzle on a TCP port until cancelled.
+    """
+    server = await asyncio.start_server(lambda r, w: serve_client(r, w, idle_timeout), host, port, limit=LINE_LIMIT)
+    print("Serving on {}".format(", ".join(str(s.getsockname()) for s in server.sockets)), file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+async def _load_session(host: str, port: int, moves: int, latencies: list, rng: random.Random) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for line in ("KEYS lrud", "NEW"):
+            writer.write(line.encode() + b"\n")
+            await reader.readline()
+        for _ in range(moves):
+            started = time.perf_counter()
+            writer.write(rng.choice("lrud").encode() + b"\n")
+            reply = await reader.readline()
+            latencies.append(time.perf_counter() - started)
+            if reply.startswith(b"SOLVED"):
+                writer.write(b"NEW\n")
+                await reader.readline()
+        writer.write(b"QUIT\n")
+        await reader.readline()
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, sessions: int, moves: int, seed: int = 1002) -> dict:
+    """
+    Open many concurrent sessions that each play random moves, and measure move latency.
+
+    Parameters:
+    host (str) -> Server address.
+    port (int) -> Server port.
+    sessions (int) -> Number of concurrent connections.
+    moves (int) -> Moves played by every connection.
+    seed (int) -> Seed for the random moves.
+
+    Returns:
+    dict -> Number of moves, wall time, moves per second and the p50/p99 latency in milliseconds.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_load_session(host, port, moves, latencies, random.Random(rng.random()))
+                           for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    count = len(latencies)
+    return {"moves": count, "seconds": elapsed, "moves_per_second": count / elapsed if elapsed else 0.0,
+            "p50_ms": 1000 * latencies[count // 2] if count else 0.0,
+            "p99_ms": 1000 * latencies[min(count - 1, count * 99 // 100)] if count else 0.0}
+
+
+def main(argv: list = None) -> int:
+    """
+    Command-line entry point: 'serve' runs the server, 'load' runs the load generator.
+    """
+    parser = argparse.ArgumentParser(description="Multi-session TCP server for the AS1 puzzle.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the game server")
+    serve.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="seconds before idle sessions close")
+    load = commands.add_parser("load", help="run the load generator against a server")
+    load.add_argument("--sessions", type=int, default=1000, help="concurrent connections")
+    load.add_argument("--moves", type=int, default=100, help="moves per connection")
+    for command in (serve, load):
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "serve":
+            asyncio.run(run_server(args.host, args.port, args.idle_timeout))
+        else:
+            result = asyncio.run(run_load(args.host, args.port, args.sessions, args.moves))
+            print("{moves} moves in {seconds:.2f}s ({moves_per_second:.0f} moves/sec), "
+                  "p50 {p50_ms:.2f} ms, p99 {p99_ms:.2f} ms".format(**result))
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
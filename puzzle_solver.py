@@ -0,0 +1,490 @@
+import sys
+import time
+from collections import namedtuple
+import numpy as np
+
+from pattern_database import load_pattern_databases, rank_positions
+from puzzle_board import SolverTimeout, generate_puzzle, is_solvable, line_conflicts
+
+# Blank moves as (name, row offset, column offset)
+MOVES = (("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1))
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+FOUND = -1  # Returned by the depth-first search once the goal is reached
+CLOCK_INTERVAL = 4095  # Nodes expanded between two looks at the deadline
+BENCHMARK_TIME_LIMIT = 30.0  # Seconds a benchmark board may take before it counts as a timeout
+TARGET_4X4 = 1.0  # Average seconds per random 4x4 board the solver aims for
+
+Solution = namedtuple("Solution", ["moves", "nodes"])
+
+
+def goal_board(size: int) -> np.ndarray:
+    """
+    Build the solved board used by AS2 (1..n^2-1 followed by the blank).
+
+    Args:
+        size (int): Size of the puzzle (n x n).
+
+    Returns:
+        np.ndarray: The goal configuration.
+    """
+    return (np.arange(1, size**2 + 1) % (size**2)).reshape((size, size))
+
+
+def check_board(puzzle: np.ndarray) -> None:
+    """
+    Check that a board is square and holds every tile from 0 to n^2-1 exactly once.
+
+    Args:
+        puzzle (np.ndarray): Configuration to check.
+
+    Raises:
+        ValueError: If the board is not square, or a tile is missing, repeated or out of range.
+    """
+    if puzzle.ndim != 2 or puzzle.shape[0] != puzzle.shape[1]:
+        raise ValueError(f"a board must be square, got shape {puzzle.shape}")
+    if not np.array_equal(np.sort(puzzle.ravel()), np.arange(puzzle.size)):
+        raise ValueError(f"a {len(puzzle)}x{len(puzzle)} board must hold each tile from 0 to {puzzle.size - 1} once")
+
+
+def apply_moves(puzzle: np.ndarray, moves: list) -> np.ndarray:
+    """
+    Apply a sequence of blank moves to a copy of a board.
+
+    Args:
+        puzzle (np.ndarray): Starting configuration.
+        moves (list): Moves of the blank ('up', 'down', 'left', 'right').
+
+    Returns:
+        np.ndarray: The configuration after all moves.
+    """
+    board = puzzle.copy()
+    offsets = {name: (d_row, d_col) for name, d_row, d_col in MOVES}
+    row, col = (int(i[0]) for i in np.where(board == 0))
+    for move in moves:
+        d_row, d_col = offsets[move]
+        board[row, col], board[row + d_row, col + d_col] = board[row + d_row, col + d_col], 0
+        row, col = row + d_row, col + d_col
+    return board
+
+
+def scramble(size: int, steps: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Scramble the goal board with a random walk of the blank that never steps straight back.
+
+    Args:
+        size (int): Size of the puzzle (n x n).
+        steps (int): Number of moves in the walk.
+        rng (np.random.Generator): Source of randomness.
+
+    Returns:
+        np.ndarray: A solvable configuration at most `steps` moves from the goal.
+    """
+    board = goal_board(size)
+    row, col = size - 1, size - 1
+    previous = None
+    for _ in range(steps):
+        options = [(name, d_row, d_col) for name, d_row, d_col in MOVES
+                   if 0 <= row + d_row < size and 0 <= col + d_col < size and name != OPPOSITE.get(previous)]
+        name, d_row, d_col = options[rng.integers(len(options))]
+        board[row, col], board[row + d_row, col + d_col] = board[row + d_row, col + d_col], 0
+        row, col = row + d_row, col + d_col
+        previous = name
+    return board
+
+
+class IDAStarSolver:
+    """
+    Optimal solver for n x n boards using IDA* with Manhattan distance plus linear conflict.
+
+    The board is copied once into a flat list; moves are made and undone in place while the
+    Manhattan sum and the per-row and per-column conflict scores are updated incrementally.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        cells = size * size
+        self.manhattan = [[0] * cells for _ in range(cells)]
+        for tile in range(1, cells):
+            goal_row, goal_col = divmod(tile - 1, size)
+            for pos in range(cells):
+                row, col = divmod(pos, size)
+                self.manhattan[tile][pos] = abs(row - goal_row) + abs(col - goal_col)
+        self.adjacent = []
+        for pos in range(cells):
+            row, col = divmod(pos, size)
+            self.adjacent.append(tuple(
+                (pos + d_row * size + d_col, name, d_row != 0) for name, d_row, d_col in MOVES
+                if 0 <= row + d_row < size and 0 <= col + d_col < size))
+        self.cells = []
+        self.blank = 0
+        self.row_conflicts = []
+        self.col_conflicts = []
+        self.h = 0
+        self.nodes = 0
+        self.path = []
+        self.deadline = None
+
+    def _row_conflict(self, row: int) -> int:
+        size = self.size
+        start = row * size
+        return line_conflicts([(tile - 1) % size for tile in self.cells[start:start + size]
+                                if tile and (tile - 1) // size == row])
+
+    def _col_conflict(self, col: int) -> int:
+        size = self.size
+        return line_conflicts([(tile - 1) // size for tile in self.cells[col::size]
+                                if tile and (tile - 1) % size == col])
+
+    def _load(self, puzzle: np.ndarray) -> None:
+        self.cells = [int(tile) for tile in puzzle.ravel()]
+        self.blank = self.cells.index(0)
+        self.row_conflicts = [self._row_conflict(i) for i in range(self.size)]
+        self.col_conflicts = [self._col_conflict(i) for i in range(self.size)]
+        self.h = (sum(self.manhattan[tile][pos] for pos, tile in enumerate(self.cells))
+                  + sum(self.row_conflicts) + sum(self.col_conflicts))
+
+    def solve(self, puzzle: np.ndarray, time_limit: float = None) -> Solution:
+        """
+        Find a shortest sequence of blank moves that solves the board.
+
+        Args:
+            puzzle (np.ndarray): Configuration of the same size as the solver.
+            time_limit (float): Seconds after which the search gives up; None for no limit.
+
+        Returns:
+            Solution: The moves and the number of nodes expanded.
+
+        Raises:
+            ValueError: If the board has the wrong size, is not a valid board or cannot be solved.
+            SolverTimeout: If the time limit is reached first.
+        """
+        if puzzle.shape != (self.size, self.size):
+            raise ValueError(f"expected a {self.size}x{self.size} puzzle, got shape {puzzle.shape}")
+        check_board(puzzle)
+        if not is_solvable(puzzle):
+            raise ValueError("puzzle is not solvable")
+        self._load(puzzle)
+        self.nodes = 0
+        self.path = []
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        bound = self.h
+        while True:
+            result = self._search(0, bound, None)
+            if result == FOUND:
+                self.path.reverse()
+                return Solution(self.path, self.nodes)
+            bound = result
+
+    def _update(self, tile: int, source: int, target: int, vertical: bool):
+        """
+        Update the heuristic after `tile` slid from `source` into the old blank `target`.
+
+        Returns:
+            tuple: Whatever _restore needs to undo the update.
+        """
+        size = self.size
+        if vertical:
+            lines, first, second, update = self.row_conflicts, source // size, target // size, self._row_conflict
+        else:
+            lines, first, second, update = self.col_conflicts, source % size, target % size, self._col_conflict
+        saved = (self.h, lines, first, second, lines[first], lines[second])
+        lines[first], lines[second] = update(first), update(second)
+        self.h += (self.manhattan[tile][target] - self.manhattan[tile][source]
+                   + lines[first] + lines[second] - saved[4] - saved[5])
+        return saved
+
+    def _restore(self, saved: tuple) -> None:
+        self.h, lines, first, second, lines[first], lines[second] = saved
+
+    def _search(self, depth: int, bound: int, back) -> int:
+        h = self.h
+        estimate = depth + h
+        if estimate > bound:
+            return estimate
+        if h == 0:
+            return FOUND
+        self.nodes += 1
+        if self.nodes & CLOCK_INTERVAL == 0 and self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SolverTimeout(self.nodes)
+        cells = self.cells
+        blank = self.blank
+        minimum = sys.maxsize
+        for target, name, vertical in self.adjacent[blank]:
+            if name == back:
+                continue
+            tile = cells[target]
+            cells[blank], cells[target] = tile, 0
+            self.blank = target
+            saved = self._update(tile, target, blank, vertical)
+            result = self._search(depth + 1, bound, OPPOSITE[name])
+            self._restore(saved)
+            self.blank = blank
+            cells[blank], cells[target] = 0, tile
+            if result == FOUND:
+                self.path.append(name)
+                return FOUND
+            if result < minimum:
+                minimum = result
+        return minimum
+
+
+class PatternDatabaseSolver(IDAStarSolver):
+    """
+    IDA* solver whose heuristic is the sum of additive disjoint pattern databases, taken over
+    the board and over its reflection in the main diagonal, whichever is larger.
+
+    The reflection maps the goal onto itself once its tiles are relabelled, so the reflected
+    board is just as far from the goal and the same tables give a second admissible sum. Both
+    views keep the rank of every group; a move changes one group in each, and its rank is
+    updated from the tiles the moved tile passes rather than ranked again. A child is cut off
+    before it is entered, and its reflected sum is not looked up once the plain one cuts it off.
+    """
+
+    def __init__(self, size: int, databases: list):
+        super().__init__(size)
+        cells = size * size
+        self.tables = [memoryview(table) for _, table in databases]
+        self.group_tiles = [tuple(pattern) for pattern, _ in databases]
+        if sorted(tile for pattern in self.group_tiles for tile in pattern) != list(range(1, cells)):
+            raise ValueError("the pattern databases must cover every tile once")
+        # Rank weight of each tile of a group: rank_positions adds up position terms times these
+        self.weights = []
+        for pattern in self.group_tiles:
+            weights = [1] * len(pattern)
+            for i in range(len(pattern) - 2, -1, -1):
+                weights[i] = weights[i + 1] * (cells - i - 1)
+            self.weights.append(tuple(weights))
+        transpose = [(pos % size) * size + pos // size for pos in range(cells)]
+        relabel = [0] + [transpose[tile - 1] + 1 for tile in range(1, cells)]
+        # Per view: where each cell lands, the label of each tile there, the (group, index, rank
+        # weights) of each tile, and for each move the change of the moved tile's cell in the
+        # view, the direction of that change and the cells it passes over
+        self.views = []
+        for place, label in ((list(range(cells)), list(range(cells))), (transpose, relabel)):
+            member = [None] * cells
+            for group, pattern in enumerate(self.group_tiles):
+                for index, tile in enumerate(pattern):
+                    member[label[tile]] = (group, index, self.weights[group])
+            passed = [None] * (cells * cells)
+            for source in range(cells):
+                for target, _, _ in self.adjacent[source]:
+                    low, high = sorted((place[source], place[target]))
+                    passed[source * cells + target] = (
+                        place[target] - place[source], 1 if place[source] < place[target] else -1,
+                        tuple(place.index(between) for between in range(low + 1, high)))
+            self.views.append((place, label, member, passed))
+        # Moves from each blank cell as (target, name, name of the move back, key into passed)
+        self.moves = [tuple((target, name, OPPOSITE[name], target * cells + blank) for target, name, _ in moves)
+                      for blank, moves in enumerate(self.adjacent)]
+        # Rank and table value of every group, and their sum, for the board and its reflection
+        self.ranks = ([0] * len(databases), [0] * len(databases))
+        self.values = ([0] * len(databases), [0] * len(databases))
+        self.sums = [0, 0]
+
+    def _load(self, puzzle: np.ndarray) -> None:
+        cells = len(self.adjacent)
+        self.cells = [int(tile) for tile in puzzle.ravel()]
+        self.blank = self.cells.index(0)
+        position_of = [0] * cells
+        for pos, tile in enumerate(self.cells):
+            position_of[tile] = pos
+        for view, (place, label, _, _) in enumerate(self.views):
+            ranks, values = self.ranks[view], self.values[view]
+            for group, pattern in enumerate(self.group_tiles):
+                # label is its own inverse, so the tile shown as `tile` in this view is label[tile]
+                ranks[group] = rank_positions([place[position_of[label[tile]]] for tile in pattern], cells)
+                values[group] = self.tables[group][ranks[group]]
+            self.sums[view] = sum(values)
+        self.h = max(self.sums)
+
+    def _search(self, depth: int, bound: int, back) -> int:
+        h = self.h
+        estimate = depth + h
+        if estimate > bound:
+            return estimate
+        if h == 0:
+            return FOUND
+        self.nodes += 1
+        if self.nodes & CLOCK_INTERVAL == 0 and self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SolverTimeout(self.nodes)
+        cells = self.cells
+        blank = self.blank
+        tables, sums = self.tables, self.sums
+        # The board itself and its mirror image, the reflection in the main diagonal
+        (_, _, plain_member, plain_passed), (_, _, mirror_member, mirror_passed) = self.views
+        plain_ranks, mirror_ranks = self.ranks
+        plain_values, mirror_values = self.values
+        plain_sum, mirror_sum = sums
+        limit = bound - depth - 1  # Largest heuristic a child may have and still be entered
+        minimum = sys.maxsize
+        for target, name, reverse, key in self.moves[blank]:
+            if name == back:
+                continue
+            tile = cells[target]
+            # The moved tile's rank term changes by its change of cell; each tile of its group that it
+            # passes over gains or loses one smaller position, whichever of the two comes later
+            plain_group, index, weights = plain_member[tile]
+            offset, sign, crossed = plain_passed[key]
+            plain_rank = plain_ranks[plain_group] + offset * weights[index]
+            for cell in crossed:
+                other, other_index, _ = plain_member[cells[cell]]
+                if other == plain_group:
+                    plain_rank += sign * weights[other_index] if other_index > index else -sign * weights[index]
+            plain_value = tables[plain_group][plain_rank]
+            plain = plain_sum + plain_value - plain_values[plain_group]
+            if plain > limit:
+                result = depth + 1 + plain
+            else:
+                mirror_group, index, weights = mirror_member[tile]
+                offset, sign, crossed = mirror_passed[key]
+                mirror_rank = mirror_ranks[mirror_group] + offset * weights[index]
+                for cell in crossed:
+                    other, other_index, _ = mirror_member[cells[cell]]
+                    if other == mirror_group:
+                        mirror_rank += sign * weights[other_index] if other_index > index else -sign * weights[index]
+                mirror_value = tables[mirror_group][mirror_rank]
+                mirror = mirror_sum + mirror_value - mirror_values[mirror_group]
+                if mirror > limit:
+                    result = depth + 1 + mirror
+                else:
+                    saved = (plain_ranks[plain_group], plain_values[plain_group],
+                             mirror_ranks[mirror_group], mirror_values[mirror_group])
+                    plain_ranks[plain_group], plain_values[plain_group] = plain_rank, plain_value
+                    mirror_ranks[mirror_group], mirror_values[mirror_group] = mirror_rank, mirror_value
+                    sums[0], sums[1] = plain, mirror
+                    cells[blank], cells[target] = tile, 0
+                    self.blank = target
+                    self.h = plain if plain > mirror else mirror
+                    result = self._search(depth + 1, bound, reverse)
+                    self.h = h
+                    self.blank = blank
+                    cells[blank], cells[target] = 0, tile
+                    sums[0], sums[1] = plain_sum, mirror_sum
+                    (plain_ranks[plain_group], plain_values[plain_group],
+                     mirror_ranks[mirror_group], mirror_values[mirror_group]) = saved
+            if result == FOUND:
+                self.path.append(name)
+                return FOUND
+            if result < minimum:
+                minimum = result
+        return minimum
+
+
+_solvers = {}
+
+
+def _solver_for(size: int) -> IDAStarSolver:
+    if size not in _solvers:
+        databases = load_pattern_databases(size)
+        _solvers[size] = PatternDatabaseSolver(size, databases) if databases else IDAStarSolver(size)
+    return _solvers[size]
+
+
+def solve(puzzle: np.ndarray, time_limit: float = None) -> Solution:
+    """
+    Solve a board optimally, reusing one solver per board size.
+
+    Pattern databases found in the default directory are memory-mapped the first time a
+    size is seen; otherwise Manhattan distance plus linear conflict is used.
+
+    Args:
+        puzzle (np.ndarray): Configuration to solve.
+        time_limit (float): Seconds after which the search gives up; None for no limit.
+
+    Returns:
+        Solution: The moves of the blank and the number of nodes expanded.
+
+    Raises:
+        ValueError: If the board is not a valid board or cannot be solved.
+        SolverTimeout: If the time limit is reached first.
+    """
+    check_board(puzzle)
+    return _solver_for(len(puzzle)).solve(puzzle, time_limit)
+
+
+def estimate(puzzle: np.ndarray) -> int:
+    """
+    Give the heuristic solve() starts from: a lower bound on the board's optimal solution length,
+    found without searching.
+
+    Args:
+        puzzle (np.ndarray): Configuration to estimate.
+
+    Returns:
+        int: Moves the board needs at least.
+
+    Raises:
+        ValueError: If the board is not a valid board.
+    """
+    check_board(puzzle)
+    solver = _solver_for(len(puzzle))
+    solver._load(puzzle)
+    return solver.h
+
+
+def benchmark_corpus(seed: int = 1002) -> list:
+    """
+    Build the fixed benchmark corpus of seeded boards.
+
+    Random 3x3 and 4x4 boards come from generate_puzzle, like the boards AS2 deals; 4x4
+    random walks from the goal give easier boards of known depth next to them.
+
+    Args:
+        seed (int): Seed for both generators.
+
+    Returns:
+        list: (label, board) pairs.
+    """
+    np.random.seed(seed)
+    corpus = [("3x3 random", generate_puzzle(3)) for _ in range(20)]
+    rng = np.random.default_rng(seed)
+    for steps in (30, 40, 50):
+        corpus += [(f"4x4 walk {steps}", scramble(4, steps, rng)) for _ in range(10)]
+    corpus += [("4x4 random", generate_puzzle(4)) for _ in range(10)]
+    return corpus
+
+
+def benchmark(corpus: list = None, time_limit: float = BENCHMARK_TIME_LIMIT) -> None:
+    """
+    Solve every board of the corpus and print the time, nodes and length per group, then the
+    random 4x4 boards against TARGET_4X4.
+
+    A board that runs out of time counts as a timeout and adds the full time limit to its
+    group's times, so averages of groups with timeouts are lower bounds.
+
+    Args:
+        corpus (list): (label, board) pairs; defaults to benchmark_corpus().
+        time_limit (float): Seconds per board; None for no limit.
+    """
+    if corpus is None:
+        corpus = benchmark_corpus()
+    groups = {}
+    for label, puzzle in corpus:
+        started = time.perf_counter()
+        try:
+            solution = solve(puzzle, time_limit)
+        except SolverTimeout:
+            groups.setdefault(label, []).append((time.perf_counter() - started, None, None))
+            continue
+        elapsed = time.perf_counter() - started
+        assert np.array_equal(apply_moves(puzzle, solution.moves), goal_board(len(puzzle)))
+        groups.setdefault(label, []).append((elapsed, solution.nodes, len(solution.moves)))
+    for label, results in groups.items():
+        count = len(results)
+        solved = [r for r in results if r[1] is not None]
+        times = sorted(r[0] for r in results)
+        print("{:<12} boards:{:>3}  timeouts:{:>3}  avg time:{:>8.4f}s  median:{:>8.4f}s  max:{:>8.4f}s"
+              "  avg nodes:{:>9.0f}  avg length:{:>5.1f}".format(
+                  label, count, count - len(solved), sum(times) / count, times[count // 2], times[-1],
+                  sum(r[1] for r in solved) / max(len(solved), 1), sum(r[2] for r in solved) / max(len(solved), 1)))
+    if "4x4 random" in groups:
+        results = groups["4x4 random"]
+        average = sum(r[0] for r in results) / len(results)
+        timeouts = sum(r[1] is None for r in results)
+        print("4x4 random: {}{:.2f}s per board on average, target {:.1f}s: {}".format(
+            ">" if timeouts else "", average, TARGET_4X4, "met" if average < TARGET_4X4 else "missed"))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,241 @@
+import os
+import numpy as np
+
+# Goals used by the text puzzle in AS1 and by the 3x3 turtle puzzle in AS2
+AS1_GOAL = ((1, 0, 8), (2, 7, 3), (6, 5, 4))
+AS2_GOAL = ((1, 2, 3), (4, 5, 6), (7, 8, 0))
+
+# Table layout: one byte per permutation of the 9 cells, indexed by rank
+STATE_COUNT = 362880  # 9!
+UNREACHABLE = 255  # Distance stored for states of the wrong parity
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "as1_distance_table.bin")
+AS2_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "as2_distance_table.bin")
+
+FACTORIALS = (40320, 5040, 720, 120, 24, 6, 2, 1, 1)
+
+# Blank moves as (name, row offset, column offset), named like the AS1 prompt
+MOVE_OFFSETS = (("left", 0, -1), ("right", 0, 1), ("up", -1, 0), ("down", 1, 0))
+
+
+def flatten_board(puzzle) -> tuple:
+    """
+    Flatten a 3x3 board given as nested rows into a tuple of 9 tiles.
+
+    Args:
+        puzzle: A 2D list (or tuple / ndarray) of tiles, 0 being the blank.
+
+    Returns:
+        tuple: The tiles in row-major order.
+    """
+    return tuple(int(tile) for row in puzzle for tile in row)
+
+
+def rank_state(state) -> int:
+    """
+    Compute the lexicographic rank of a permutation of the tiles 0..8.
+
+    Args:
+        state: Flat sequence of the 9 tiles.
+
+    Returns:
+        int: Rank in range(9!), usable as an index into a distance table.
+    """
+    rank = 0
+    seen = 0
+    for i, tile in enumerate(state):
+        smaller_unseen = tile - bin(seen & ((1 << tile) - 1)).count("1")
+        rank += smaller_unseen * FACTORIALS[i]
+        seen |= 1 << tile
+    return rank
+
+
+def unrank_state(rank: int) -> tuple:
+    """
+    Rebuild the permutation with the given lexicographic rank.
+
+    Args:
+        rank (int): Rank in range(9!).
+
+    Returns:
+        tuple: Flat sequence of the 9 tiles.
+    """
+    remaining = list(range(9))
+    state = []
+    for factorial in FACTORIALS:
+        index, rank = divmod(rank, factorial)
+        state.append(remaining.pop(index))
+    return tuple(state)
+
+
+def neighbours(state: tuple):
+    """
+    Yield every board reachable from a flat state with a single move.
+
+    Args:
+        state (tuple): Flat sequence of the 9 tiles.
+
+    Yields:
+        tuple: (move name, next flat state) pairs.
+    """
+    blank = state.index(0)
+    row, col = divmod(blank, 3)
+    for name, d_row, d_col in MOVE_OFFSETS:
+        new_row, new_col = row + d_row, col + d_col
+        if 0 <= new_row < 3 and 0 <= new_col < 3:
+            target = new_row * 3 + new_col
+            cells = list(state)
+            cells[blank], cells[target] = cells[target], 0
+            yield name, tuple(cells)
+
+
+def build_distance_table(goal=AS1_GOAL) -> np.ndarray:
+    """
+    Run a breadth-first search from the goal over the whole 3x3 state space.
+
+    Args:
+        goal: Goal board as nested rows.
+
+    Returns:
+        np.ndarray: uint8 array of length 9!, holding the optimal number of moves
+        from each ranked state to the goal, or UNREACHABLE.
+    """
+    table = bytearray([UNREACHABLE]) * STATE_COUNT
+    start = flatten_board(goal)
+    table[rank_state(start)] = 0
+    frontier = [start]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            for _, neighbour in neighbours(state):
+                index = rank_state(neighbour)
+                if table[index] == UNREACHABLE:
+                    table[index] = depth
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return np.frombuffer(table, dtype=np.uint8).copy()
+
+
+def save_distance_table(table: np.ndarray, path: str = DEFAULT_TABLE_PATH) -> None:
+    """
+    Write a distance table to disk as raw bytes. The bytes go to a temporary file that is
+    then renamed over the destination, so an interrupted write never leaves a short table.
+
+    Args:
+        table (np.ndarray): Table returned by build_distance_table.
+        path (str): Destination file.
+    """
+    temporary = path + ".tmp"
+    np.asarray(table, dtype=np.uint8).tofile(temporary)
+    os.replace(temporary, path)
+
+
+def load_distance_table(path: str = DEFAULT_TABLE_PATH) -> np.ndarray:
+    """
+    Memory-map a distance table written by save_distance_table.
+
+    Args:
+        path (str): File holding the table.
+
+    Returns:
+        np.ndarray: Read-only uint8 memmap of length 9!.
+    """
+    return np.memmap(path, dtype=np.uint8, mode="r", shape=(STATE_COUNT,))
+
+
+def is_valid_table_file(path: str, goal=AS1_GOAL) -> bool:
+    """
+    Check that a file holds a whole distance table for the given goal.
+
+    Args:
+        path (str): File holding the table.
+        goal: Goal board the table should be built for.
+
+    Returns:
+        bool: True if the file has one byte per state and the goal's entry is 0.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) != STATE_COUNT:
+        return False
+    return int(load_distance_table(path)[rank_state(flatten_board(goal))]) == 0
+
+
+def get_distance_table(path: str = DEFAULT_TABLE_PATH, goal=AS1_GOAL) -> np.ndarray:
+    """
+    Load a distance table from disk, building and saving it first if it is missing, cut
+    short or built for another goal.
+
+    Args:
+        path (str): File holding the table.
+        goal: Goal board the table is built for when it has to be created.
+
+    Returns:
+        np.ndarray: The distance table.
+    """
+    if not is_valid_table_file(path, goal):
+        save_distance_table(build_distance_table(goal), path)
+    return load_distance_table(path)
+
+
+def moves_remaining(table: np.ndarray, puzzle):
+    """
+    Look up the optimal number of moves left to solve a board.
+
+    Args:
+        table (np.ndarray): Distance table for the board's goal.
+        puzzle: Board as nested rows.
+
+    Returns:
+        int or None: Number of moves, or None if the goal cannot be reached.
+    """
+    distance = int(table[rank_state(flatten_board(puzzle))])
+    return None if distance == UNREACHABLE else distance
+
+
+def best_move(table: np.ndarray, puzzle):
+    """
+    Find a move that brings the board one step closer to the goal.
+
+    Args:
+        table (np.ndarray): Distance table for the board's goal.
+        puzzle: Board as nested rows.
+
+    Returns:
+        str or None: 'left', 'right', 'up' or 'down' (direction of the blank),
+        or None if the board is solved or unsolvable.
+    """
+    state = flatten_board(puzzle)
+    distance = int(table[rank_state(state)])
+    if distance == 0 or distance == UNREACHABLE:
+        return None
+    for name, neighbour in neighbours(state):
+        if table[rank_state(neighbour)] == distance - 1:
+            return name
+    return None
+
+
+def optimal_solution(table: np.ndarray, puzzle) -> list:
+    """
+    Read an optimal solution for a board off the distance table.
+
+    Args:
+        table (np.ndarray): Distance table for the board's goal.
+        puzzle: Board as nested rows.
+
+    Returns:
+        list: Moves of the blank ('left', 'right', 'up', 'down'); empty if the
+        board is solved or unsolvable.
+    """
+    state = flatten_board(puzzle)
+    distance = int(table[rank_state(state)])
+    if distance == UNREACHABLE:
+        return []
+    solution = []
+    while distance:
+        for name, neighbour in neighbours(state):
+            if table[rank_state(neighbour)] == distance - 1:
+                solution.append(name)
+                state = neighbour
+                distance -= 1
+                break
+    return solution
@@ -0,0 +1,390 @@
+import os
+import struct
+import sys
+import time
+import numpy as np
+
+MAGIC = b"PZLG\x01"  # File signature and format version
+RECORD = struct.Struct("<BIH")  # Record kind, session id, board size or move count
+START, MOVES = 1, 2  # Record kinds: initial board of a session, a run of its moves
+MOVE_CODES = {"up": 0, "down": 1, "left": 2, "right": 3}  # Moves of the blank, 2 bits each
+MOVE_NAMES = tuple(sorted(MOVE_CODES, key=MOVE_CODES.get))
+MAX_RUN = 65535  # Most moves in one record
+FLUSH_EVERY = 4096  # Moves buffered per session before they are written
+CHECKPOINT_EVERY = 1024  # Moves between two stored boards during replay
+
+
+def pack_moves(codes) -> bytes:
+    """
+    Pack move codes four to a byte, the first move in the lowest bits.
+
+    Args:
+        codes: Sequence of move codes (0 to 3).
+
+    Returns:
+        bytes: The packed moves, padded with zero bits.
+    """
+    codes = np.frombuffer(bytes(codes), dtype=np.uint8)
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape((-1, 4))
+    return (quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6).tobytes()
+
+
+def unpack_moves(data: bytes, count: int) -> np.ndarray:
+    """
+    Unpack moves written by pack_moves.
+
+    Args:
+        data (bytes): The packed moves.
+        count (int): Number of moves to keep.
+
+    Returns:
+        np.ndarray: uint8 move codes.
+    """
+    packed = np.frombuffer(data, dtype=np.uint8)
+    return np.stack([packed & 3, packed >> 2 & 3, packed >> 4 & 3, packed >> 6], axis=1).ravel()[:count]
+
+
+def iter_records(path: str, offsets: bool = False):
+    """
+    Read the records of a session log in order.
+
+    Args:
+        path (str): The log file.
+        offsets (bool): Also yield where each record ends in the file.
+
+    Yields:
+        tuple: (kind, session id, payload) where the payload is the initial board for START
+        records and the move codes for MOVES records, followed by the end offset if asked for.
+
+    Raises:
+        ValueError: If the file is not a session log.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session log")
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return  # End of the log, or a record cut short by a crash
+            kind, session, count = RECORD.unpack(header)
+            if kind == START:
+                data = f.read(2 * count * count)
+                if len(data) < 2 * count * count:
+                    return
+                payload = np.frombuffer(data, dtype="<u2").astype(int).reshape((count, count))
+            elif kind == MOVES:
+                data = f.read(-(-count // 4))
+                if len(data) < -(-count // 4):
+                    return
+                payload = unpack_moves(data, count)
+            else:
+                raise ValueError(f"unknown record kind {kind} in {path}")
+            yield (kind, session, payload, f.tell()) if offsets else (kind, session, payload)
+
+
+def load_sessions(path: str) -> dict:
+    """
+    Gather every session of a log.
+
+    Args:
+        path (str): The log file.
+
+    Returns:
+        dict: Session id -> (initial board, uint8 move codes).
+    """
+    boards, runs = {}, {}
+    for kind, session, payload in iter_records(path):
+        if kind == START:
+            boards[session] = payload
+            runs[session] = []
+        elif session in runs:
+            runs[session].append(payload)
+    return {session: (boards[session], np.concatenate(runs[session]) if runs[session] else np.zeros(0, np.uint8))
+            for session in boards}
+
+
+class SessionRecorder:
+    """
+    Appends games to a binary log: one START record with the initial board per game, then
+    the moves of the blank at 2 bits each.
+
+    Moves are buffered per game and written in runs, so many games can share one log and a
+    crash loses at most the moves not yet flushed. Existing logs are only ever appended to,
+    after cutting off a last record left incomplete by a crash.
+    """
+
+    def __init__(self, path: str, flush_every: int = FLUSH_EVERY):
+        """
+        Args:
+            path (str): The log file; it is created if missing.
+            flush_every (int): Moves buffered per game before they are written.
+        """
+        self.flush_every = min(flush_every, MAX_RUN)
+        self.next_session = 0
+        if os.path.exists(path) and os.path.getsize(path):
+            end = len(MAGIC)  # Offset just past the last complete record
+            for _, session, _, end in iter_records(path, offsets=True):
+                self.next_session = max(self.next_session, session + 1)
+            # Appending after a partial record would make readers take its header's count and
+            # read on into the new records, so the partial bytes are dropped first
+            if os.path.getsize(path) > end:
+                os.truncate(path, end)
+        self.file = open(path, "ab")
+        if not self.file.tell():
+            self.file.write(MAGIC)
+        self.pending = {}  # session id -> move codes not written yet
+
+    def start(self, board) -> int:
+        """
+        Begin recording a game.
+
+        Args:
+            board: Initial configuration, as nested rows or an n x n array.
+
+        Returns:
+            int: The session id to pass to record().
+        """
+        tiles = np.asarray(board)
+        session = self.next_session
+        self.next_session += 1
+        self.file.write(RECORD.pack(START, session, len(tiles)) + tiles.astype("<u2").tobytes())
+        self.pending[session] = bytearray()
+        return session
+
+    def record(self, session: int, move: str) -> None:
+        """
+        Log one move of the blank.
+
+        Args:
+            session (int): Id returned by start().
+            move (str): 'up', 'down', 'left' or 'right'.
+        """
+        codes = self.pending[session]
+        codes.append(MOVE_CODES[move])
+        if len(codes) >= self.flush_every:
+            self._write(session)
+
+    def _write(self, session: int) -> None:
+        codes = self.pending[session]
+        if codes:
+            self.file.write(RECORD.pack(MOVES, session, len(codes)) + pack_moves(codes))
+            self.pending[session] = bytearray()
+
+    def flush(self) -> None:
+        """
+        Write every buffered move and push it to the operating system.
+        """
+        for session in self.pending:
+            self._write(session)
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SessionReplay:
+    """
+    Rebuilds the board at any point of a recorded game.
+
+    The moves are checked once, all together, then played through while a copy of the
+    board is stored every `checkpoint_every` moves; any later state costs at most that
+    many moves from the nearest checkpoint.
+    """
+
+    def __init__(self, board, moves, checkpoint_every: int = CHECKPOINT_EVERY):
+        """
+        Args:
+            board: Initial configuration, as nested rows or an n x n array.
+            moves: Move codes (as returned by load_sessions) or move names.
+            checkpoint_every (int): Moves between two stored boards.
+
+        Raises:
+            ValueError: If a move would take the blank off the board.
+        """
+        board = np.asarray(board)
+        self.size = len(board)
+        if len(moves) and isinstance(moves[0], str):
+            moves = [MOVE_CODES[move] for move in moves]
+        self.moves = np.asarray(moves, dtype=np.uint8)
+        self.checkpoint_every = checkpoint_every
+        self.deltas = (-self.size, self.size, -1, 1)
+        cells = board.ravel().tolist()
+        blank = cells.index(0)
+        self._check(blank)
+        codes = self.moves.tobytes()
+        self.checkpoints = [(cells[:], blank)]
+        for start in range(0, len(codes), checkpoint_every):
+            blank = self._play(cells, blank, codes[start:start + checkpoint_every])
+            self.checkpoints.append((cells[:], blank))
+
+    def _check(self, blank: int) -> None:
+        size = self.size
+        steps = np.array(self.deltas)[self.moves]
+        before = blank + np.concatenate(([0], np.cumsum(steps)[:-1])) if len(steps) else steps
+        after = before + steps
+        col = before % size
+        illegal = ((after < 0) | (after >= size * size) | ((self.moves == 2) & (col == 0))
+                   | ((self.moves == 3) & (col == size - 1)))
+        if illegal.any():
+            step = int(np.argmax(illegal))
+            raise ValueError(f"move {step} ({MOVE_NAMES[self.moves[step]]}) leaves the board")
+
+    def _play(self, cells: list, blank: int, codes: bytes) -> int:
+        deltas = self.deltas
+        for code in codes:
+            target = blank + deltas[code]
+            cells[blank] = cells[target]
+            blank = target
+        cells[blank] = 0
+        return blank
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def board_at(self, step: int) -> np.ndarray:
+        """
+        Args:
+            step (int): Number of moves played, from 0 to len(self); negative counts from the end.
+
+        Returns:
+            np.ndarray: The board after that many moves.
+        """
+        if step < 0:
+            step += len(self.moves) + 1
+        if not 0 <= step <= len(self.moves):
+            raise IndexError(f"step {step} is outside 0..{len(self.moves)}")
+        checkpoint, offset = divmod(step, self.checkpoint_every)
+        cells, blank = self.checkpoints[checkpoint]
+        cells = cells[:]
+        start = checkpoint * self.checkpoint_every
+        self._play(cells, blank, self.moves[start:start + offset].tobytes())
+        return np.array(cells).reshape((self.size, self.size))
+
+
+def benchmark(games: int = 20, moves: int = 100000, seed: int = 1002) -> None:
+    """
+    Record random games on 3x3 and 4x4 boards, then time replaying them and random access.
+
+    Args:
+        games (int): Games per board size.
+        moves (int): Moves per game.
+        seed (int): Seed for the moves.
+    """
+    import tempfile
+    from packed_board import move_targets
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.log")
+        with SessionRecorder(path) as recorder:
+            for size in (3, 4):
+                targets = move_targets(size)
+                for _ in range(games):
+                    board = (np.arange(1, size**2 + 1) % size**2).reshape((size, size))
+                    session, blank = recorder.start(board), size * size - 1
+                    for choice in rng.integers(0, 12, moves).tolist():
+                        options = list(targets[blank].items())
+                        move, blank = options[choice % len(options)]
+                        recorder.record(session, move)
+        size_on_disk = os.path.getsize(path)
+        started = time.perf_counter()
+        sessions = load_sessions(path)
+        loaded = time.perf_counter()
+        replays = [SessionReplay(board, codes) for board, codes in sessions.values()]
+        replayed = time.perf_counter()
+        for replay in replays:
+            for step in rng.integers(0, len(replay) + 1, 1000).tolist():
+                replay.board_at(step)
+        looked_up = time.perf_counter()
+    total = sum(len(replay) for replay in replays)
+    print("{} moves in {} bytes ({:.2f} bits/move)".format(total, size_on_disk, 8 * size_on_disk / total))
+    print("load {:.3f}s, replay {:.3f}s ({:.2f}M moves/sec), {:.1f} us per random board_at".format(
+        loaded - started, replayed - loaded, total / (replayed - loaded) / 1e6,
+        1e6 * (looked_up - replayed) / (1000 * len(replays))))
+
+
+def check_crash_recovery(size: int = 3, moves: int = 50) -> None:
+    """
+    Write a log, cut it inside its last record as a crash would, reopen it with a recorder
+    and check that the complete games and a game recorded afterwards still replay.
+
+    Args:
+        size (int): Board size of the games.
+        moves (int): Moves per game.
+
+    Raises:
+        ValueError: If a game is lost or replays differently.
+    """
+    import tempfile
+    from packed_board import move_targets
+    targets = move_targets(size)
+    board = (np.arange(1, size**2 + 1) % size**2).reshape((size, size))
+    names = []
+    blank = size * size - 1
+    for choice in range(moves):
+        options = list(targets[blank].items())
+        move, blank = options[choice * 7 % len(options)]
+        names.append(move)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.log")
+        with SessionRecorder(path, flush_every=moves) as recorder:
+            for _ in range(2):
+                session = recorder.start(board)
+                for move in names:
+                    recorder.record(session, move)
+        for cut in (1, RECORD.size + 1):  # Inside the last run of moves, then inside its header
+            complete = os.path.getsize(path)
+            with open(path, "rb+") as f:
+                f.truncate(complete - cut)
+            with SessionRecorder(path) as recorder:
+                session = recorder.start(board)
+                for move in names:
+                    recorder.record(session, move)
+            sessions = load_sessions(path)
+            expected = SessionReplay(board, names).board_at(-1)
+            if not np.array_equal(SessionReplay(*sessions[session]).board_at(-1), expected):
+                raise ValueError(f"the game recorded after a cut of {cut} bytes does not replay")
+            if not np.array_equal(SessionReplay(*sessions[0]).board_at(-1), expected):
+                raise ValueError(f"a game written before a cut of {cut} bytes was lost")
+    print("ok: logs cut short by a crash are recovered")
+
+
+def main(argv: list) -> int:
+    """
+    Without arguments run the benchmark; with 'check' check the recovery of logs cut short by
+    a crash; with a log file list its sessions, or print the board of one session after a
+    given number of moves.
+
+    Args:
+        argv (list): [check] or [LOG [SESSION [STEP]]]
+
+    Returns:
+        int: Exit status.
+    """
+    if not argv:
+        benchmark()
+        return 0
+    if argv == ["check"]:
+        check_crash_recovery()
+        return 0
+    sessions = load_sessions(argv[0])
+    if len(argv) == 1:
+        for session, (board, codes) in sessions.items():
+            print("session {}: {}x{}, {} moves".format(session, len(board), len(board), len(codes)))
+        return 0
+    board, codes = sessions[int(argv[1])]
+    replay = SessionReplay(board, codes)
+    print(replay.board_at(int(argv[2]) if len(argv) > 2 else -1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,535 @@
+import random
+import sys
+import time
+from collections import deque
+import numpy as np
+
+# The play area is a grid of 20-pixel cells; cell (col, row) is drawn at (20 * col, 20 * row - 40)
+CELL = 20
+GRID_MIN, GRID_MAX = -12, 12  # Range of both cell coordinates
+WIDTH = GRID_MAX - GRID_MIN + 1  # Cells per row and per column
+STRIDE = WIDTH + 2  # Row length of the occupancy grids, which have a border of wall cells
+GRID_CELLS = STRIDE * STRIDE
+START_CELL = (0, 2)  # Cell of the snake's head at the start, pixel (0, 0)
+
+DIRECTIONS = {"Right": (1, 0), "Up": (0, 1), "Left": (-1, 0), "Down": (0, -1)}
+PAUSE_KEY = "space"
+
+# Timings, in milliseconds
+NORMAL_SPEED = 200  # Between two snake moves
+SLOW_SPEED = 350  # Between two snake moves while the snake is growing
+MONSTER_SPEED = (350, 700)  # Range of the pause between two monster moves
+FOOD_MOVE_TIME = (5000, 10000)  # Range of the pause between two food moves
+CONTACT_INTERVAL = 500  # Between two checks for monsters touching the body
+TICK = 10  # Step used by the view and the benchmark
+
+START_SIZE = 5  # Body segments the snake grows to before eating
+FOOD_COUNT = 5  # Food items, worth 1 to FOOD_COUNT segments
+MONSTER_COUNT = 4
+MONSTER_RADIUS = 9  # Monsters start at most this many cells from the centre on each axis
+MONSTER_CLEARANCE = 2.5  # Monsters start further than this many cells from the snake
+SCALAR_MONSTERS = 16  # Up to this many monsters are moved one by one rather than as arrays
+
+
+def cell_to_pixel(cell: tuple) -> tuple:
+    """
+    Convert grid coordinates to the turtle coordinates the cell is drawn at.
+
+    Parameters:
+        cell (tuple): (col, row) of the cell.
+
+    Returns:
+        tuple: (x, y) in pixels.
+    """
+    return CELL * cell[0], CELL * cell[1] - 40
+
+
+def cell_index(cell: tuple) -> int:
+    """
+    Returns:
+        int: Position of a cell in the occupancy grids, which are stored row by row.
+    """
+    return (cell[1] - GRID_MIN + 1) * STRIDE + cell[0] - GRID_MIN + 1
+
+
+def cell_indexes(cells: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: cell_index of every row of an (n, 2) array of cells.
+    """
+    return (cells[:, 1] - GRID_MIN + 1) * STRIDE + cells[:, 0] - GRID_MIN + 1
+
+
+def in_bounds(cell: tuple) -> bool:
+    """
+    Returns:
+        bool: True if the cell is inside the play area.
+    """
+    return GRID_MIN <= cell[0] <= GRID_MAX and GRID_MIN <= cell[1] <= GRID_MAX
+
+
+# 1 on the border around the play area, so neighbours of any cell can be read without bounds checks
+WALLS = bytearray(GRID_CELLS)
+for _position in range(GRID_CELLS):
+    WALLS[_position] = _position < STRIDE or _position >= GRID_CELLS - STRIDE or _position % STRIDE in (0, STRIDE - 1)
+# Offsets in the grids of a cell and its 8 neighbours
+NEIGHBOURHOOD = tuple(d_row * STRIDE + d_col for d_row in (-1, 0, 1) for d_col in (-1, 0, 1))
+STEP_CELLS = np.array(list(DIRECTIONS.values()))  # (4, 2) column and row step of each direction
+STEP_OFFSETS = STEP_CELLS[:, 1] * STRIDE + STEP_CELLS[:, 0]  # Grid offset of each direction
+STEP_LIST = STEP_OFFSETS.tolist()  # The same offsets as ints, for the loops in plain Python
+UNREACHABLE = 1 << 16  # Flow field distance of cells with no path to the head
+# Grid positions next to each grid position that are not walls, none for the walls themselves
+NEIGHBOURS = [() if WALLS[position] else tuple(position + step for step in STEP_LIST if not WALLS[position + step])
+              for position in range(GRID_CELLS)]
+# (GRID_CELLS, 2) column and row of the cell at each grid position
+POSITION_CELLS = np.array([(position % STRIDE + GRID_MIN - 1, position // STRIDE + GRID_MIN - 1)
+                           for position in range(GRID_CELLS)])
+# Empty flow field; walls are further than any reachable or unreachable cell so nothing steps onto them
+EMPTY_FIELD = [UNREACHABLE + wall for wall in WALLS]
+# Cells a monster may start on: near the centre, but clear of the snake's starting cell
+MONSTER_START_CELLS = np.array([
+    (col, row)
+    for row in range(START_CELL[1] - MONSTER_RADIUS, START_CELL[1] + MONSTER_RADIUS + 1)
+    for col in range(START_CELL[0] - MONSTER_RADIUS, START_CELL[0] + MONSTER_RADIUS + 1)
+    if (col - START_CELL[0]) ** 2 + (row - START_CELL[1]) ** 2 > MONSTER_CLEARANCE ** 2])
+
+
+class GameState:
+    """
+    The rules of the snake game as plain data, with no turtle objects or Tk timers.
+
+    Time advances only through step(dt, inputs), which fires the snake, monster, food and
+    contact timers that fall due in the order of their due times, so a game is fully
+    determined by its seed and the inputs given to each step.
+
+    What stands on each cell is kept in occupancy grids (one byte per cell) that are
+    updated as things move, so collision, contact and food checks are lookups whose cost
+    does not grow with the snake.
+
+    Monsters follow a flow field: the distance from every cell to the head, found by one
+    breadth-first search that is shared by all monsters and redone only after the snake moves.
+    They are kept as a list of grid positions, also shown as an (m, 2) array of cells, and a
+    crowd of them makes its first move all together with array operations.
+    """
+
+    def __init__(self, seed=None, monsters: int = MONSTER_COUNT, food: int = FOOD_COUNT):
+        """
+        Parameters:
+            seed: Seed for the food and monster placement and the random timings.
+            monsters (int): Number of monsters.
+            food (int): Number of food items.
+
+        Raises:
+            ValueError: If there are not enough free cells for the monsters.
+        """
+        self.rng = random.Random(seed)
+        self.time = 0  # Milliseconds since the game started
+        self.head = START_CELL
+        self.body = deque([START_CELL])  # Cells of the snake, tail first and head last
+        # Segments of the body on each cell; the body may cross itself, but a cell is only
+        # re-entered every other move, so the counts stay far below 256
+        self.body_cells = bytearray(GRID_CELLS)
+        self.body_cells[cell_index(START_CELL)] = 1
+        self.food_cells = bytearray(GRID_CELLS)  # Index + 1 of the uneaten food on each cell
+        self.monster_cells = bytearray(GRID_CELLS)  # 1 where a monster stands
+        self.length = 1  # Cells the body keeps
+        self.size = START_SIZE  # Segments the snake grows to
+        self.direction = None  # Key of the current direction, None before the first key
+        self.paused = False
+        self.blocked = False  # The last move ran into the edge of the play area
+        self.contacts = 0
+        self.outcome = None  # None while playing, then "won" or "lost"
+        self.food = self._place_food(food)  # Cell of every food item
+        self.eaten = [False] * len(self.food)
+        self.remaining = len(self.food)  # Food items not eaten yet
+        for index, cell in enumerate(self.food):
+            self.food_cells[cell_index(cell)] = index + 1
+        self.monster_array = self._place_monsters(monsters)  # Cached cells of the monsters, see monsters
+        self.positions = cell_indexes(self.monster_array).tolist()  # Grid position of every monster
+        # Flow field towards the head, as a list and as an array, None until needed after the snake moves
+        self.field = self.field_array = None
+        self.timers = {"snake": 100, "monsters": 100, "food": 5000, "contact": 0}  # Next due time of each
+        self.events = []  # What happened during the last step, for the view
+
+    def _place_food(self, count: int) -> list:
+        cells = set()
+        while len(cells) < count:
+            cells.add((self.rng.randint(GRID_MIN, GRID_MAX), self.rng.randint(GRID_MIN, GRID_MAX)))
+        return sorted(cells)
+
+    def _place_monsters(self, count: int) -> np.ndarray:
+        # Sample distinct start cells directly, so placement takes the same time however
+        # crowded the area gets, and a count that cannot fit fails instead of looping forever
+        if count > len(MONSTER_START_CELLS):
+            raise ValueError(f"{count} monsters do not fit in the {len(MONSTER_START_CELLS)} start cells")
+        monsters = MONSTER_START_CELLS[self.rng.sample(range(len(MONSTER_START_CELLS)), count)]
+        np.frombuffer(self.monster_cells, dtype=np.uint8)[cell_indexes(monsters)] = 1
+        return monsters
+
+    @property
+    def monsters(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (m, 2) array, the cell of every monster, rebuilt from their grid positions
+            only when it is asked for after they moved.
+        """
+        if self.monster_array is None:
+            self.monster_array = POSITION_CELLS[self.positions]
+        return self.monster_array
+
+    def place_snake(self, cells) -> None:
+        """
+        Put the snake on the given cells, e.g. to set up a scenario.
+
+        Parameters:
+            cells: Cells of the body, tail first and head last.
+        """
+        self.body = deque(cells)
+        self.head = self.body[-1]
+        self.body_cells = bytearray(GRID_CELLS)
+        for cell in self.body:
+            self.body_cells[cell_index(cell)] += 1
+        self.field = self.field_array = None
+
+    @property
+    def motion(self):
+        """
+        Returns:
+            str or None: The direction being followed, 'Pause' if the snake is stopped, or None
+            before the first key.
+        """
+        return "Pause" if self.paused or self.blocked else self.direction
+
+    def press(self, key: str) -> None:
+        """
+        Apply a key: an arrow sets the direction and resumes, space pauses or resumes.
+
+        Parameters:
+            key (str): 'Up', 'Down', 'Left', 'Right' or 'space'.
+        """
+        if key == PAUSE_KEY:
+            self.paused = not self.paused
+        elif key in DIRECTIONS:
+            self.direction = key
+            self.paused = False
+            self.blocked = False
+
+    def step(self, dt: int = TICK, inputs=()) -> list:
+        """
+        Advance the game by a fixed amount of time.
+
+        Parameters:
+            dt (int): Milliseconds to advance.
+            inputs: Keys pressed since the previous step, applied first.
+
+        Returns:
+            list: The events of this step, e.g. ('moved',), ('ate', index), ('food_moved', index),
+            ('monsters_moved', indexes), ('contact',), ('won',) or ('lost',).
+        """
+        self.events = []
+        for key in inputs:
+            self.press(key)
+        end = self.time + dt
+        while self.outcome is None:
+            name = min(self.timers, key=self.timers.get)
+            if self.timers[name] > end:
+                break
+            self.time = self.timers[name]
+            getattr(self, "_tick_" + name)()
+        self.time = end
+        return self.events
+
+    def _end(self, outcome: str) -> None:
+        self.outcome = outcome
+        self.events.append((outcome,))
+
+    def caught(self) -> bool:
+        """
+        Returns:
+            bool: True if a monster is on the head or on one of the 8 cells around it.
+        """
+        position = cell_index(self.head)
+        monster_cells = self.monster_cells
+        for offset in NEIGHBOURHOOD:
+            if monster_cells[position + offset]:
+                return True
+        return False
+
+    def _tick_snake(self) -> None:
+        if self.caught():
+            self.contacts += 1
+            self._end("lost")
+            return
+        self.timers["snake"] = self.time + self._move_snake()
+        self._eat()
+
+    def _move_snake(self) -> int:
+        """
+        Move the head one cell and grow or drag the body.
+
+        Returns:
+            int: Milliseconds until the next move.
+        """
+        if self.paused or self.direction is None:
+            return NORMAL_SPEED
+        d_col, d_row = DIRECTIONS[self.direction]
+        cell = (self.head[0] + d_col, self.head[1] + d_row)
+        if not in_bounds(cell):
+            self.blocked = True
+            return NORMAL_SPEED
+        self.blocked = False
+        self.head = cell
+        self.field = self.field_array = None
+        self.body.append(cell)
+        self.body_cells[cell_index(cell)] += 1
+        if len(self.body) > self.length:
+            self.body_cells[cell_index(self.body.popleft())] -= 1
+        interval = SLOW_SPEED if self.length < self.size else NORMAL_SPEED
+        if self.length <= self.size:
+            self.length += 1
+        self.events.append(("moved",))
+        return interval
+
+    def _eat(self) -> None:
+        position = cell_index(self.head)
+        food = self.food_cells[position]
+        if not food:
+            return
+        self.food_cells[position] = 0
+        self.eaten[food - 1] = True
+        self.remaining -= 1
+        self.size += food
+        self.events.append(("ate", food - 1))
+        if not self.remaining:
+            self._end("won")
+
+    def _tick_monsters(self) -> None:
+        self.move_monsters()
+        self.timers["monsters"] = self.time + self.rng.randint(*MONSTER_SPEED)
+
+    def flow_field(self) -> list:
+        """
+        Breadth-first search from the head over the grid. Walls stop the search; body cells get
+        a distance but the search does not go on through them, so paths lead around the snake
+        while monsters can still step onto its edge.
+
+        The search goes one distance at a time and stops once every monster and the cells around
+        it have their distance, since monsters only ever move closer to the head until the field
+        is redone.
+
+        Returns:
+            list: Moves from each grid position to the head, UNREACHABLE where no path leads
+            there or the search stopped before, and more than that on walls.
+        """
+        field = EMPTY_FIELD[:]
+        start = cell_index(self.head)
+        field[start] = 0
+        frontier = [start]
+        body_cells, monster_cells = self.body_cells, self.monster_cells
+        unreached = len(self.positions) - monster_cells[start]
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []  # Cells at this distance that the search goes on from
+            for position in frontier:
+                for target in NEIGHBOURS[position]:
+                    if field[target] == UNREACHABLE:
+                        field[target] = distance
+                        if not body_cells[target]:
+                            reached.append(target)
+                        if monster_cells[target]:
+                            unreached -= 1
+            if not unreached:
+                # Every monster is reached; one more distance covers the cells around the farthest
+                for position in reached:
+                    for target in NEIGHBOURS[position]:
+                        if field[target] == UNREACHABLE:
+                            field[target] = distance + 1
+                break
+            frontier = reached
+        return field
+
+    def move_monsters(self) -> None:
+        """
+        Move every monster to its free neighbouring cell closest to the head; a monster stays put
+        if no free neighbour is closer than its own cell.
+
+        All monsters choose at once. When several choose the same cell the first one gets it, and
+        the others choose again among the cells still free, until no monster can move. After the
+        first round only the monsters that lost a cell or stand next to a closer cell just freed
+        can choose differently, so in a crowd only they choose again. A crowd makes its first choice
+        with array operations; the later rounds, and every round for a few monsters, run in plain
+        Python.
+        """
+        if self.field is None:
+            self.field = self.flow_field()
+        crowd = len(self.positions) > SCALAR_MONSTERS
+        if crowd:
+            moved, choosing, at = self._first_round_arrays()
+            done = set(moved)
+        else:
+            moved, choosing = [], range(len(self.positions))
+        field, positions, occupied = self.field, self.positions, self.monster_cells
+        right, up, left, down = STEP_LIST
+        while choosing:
+            claims, losers = {}, []  # Target position -> index of the first monster choosing it
+            for index in choosing:
+                here = positions[index]
+                best, choice = field[here], None
+                for target in (here + right, here + up, here + left, here + down):
+                    if field[target] < best and not occupied[target]:
+                        best, choice = field[target], target
+                if choice is None:
+                    continue
+                if choice in claims:
+                    losers.append(index)
+                else:
+                    claims[choice] = index
+            if not claims:
+                break
+            vacated = []
+            for target, index in claims.items():
+                here = positions[index]
+                vacated.append(here)
+                occupied[here] = 0
+                occupied[target] = 1
+                positions[index] = target
+                moved.append(index)
+            if crowd:
+                for target, index in claims.items():
+                    at[target] = index
+                done.update(claims.values())
+                choosing = self._choosing_again(done, losers, vacated, at)
+            else:
+                # A few monsters: every one that has not moved simply chooses again
+                movers = set(claims.values())
+                choosing = [index for index in choosing if index not in movers]
+        if moved:
+            self.monster_array = None
+            self.events.append(("monsters_moved", moved))
+
+    def _first_round_arrays(self) -> tuple:
+        """
+        Play the first round of move_monsters for all monsters with array operations.
+
+        Returns:
+            tuple: (indexes of the monsters that moved, indexes of the monsters that now have a free
+            cell closer to the head than their own, in increasing order, and a list from grid
+            position to the index of the monster there).
+        """
+        if self.field_array is None:
+            self.field_array = np.array(self.field)
+        field = self.field_array
+        occupied = np.frombuffer(self.monster_cells, dtype=np.uint8)
+        positions = np.array(self.positions)
+        targets = positions[:, None] + STEP_OFFSETS
+        distances = np.where(occupied[targets], UNREACHABLE, field[targets])
+        choices = distances.argmin(axis=1)
+        movers = np.flatnonzero(distances[np.arange(len(positions)), choices] < field[positions])
+        chosen = targets[movers, choices[movers]]
+        # np.unique keeps the first mover, the lowest index, for each target cell
+        _, first = np.unique(chosen, return_index=True)
+        winners = movers[first]
+        vacated = positions[winners]
+        occupied[vacated] = 0
+        occupied[chosen[first]] = 1
+        positions[winners] = chosen[first]
+        self.positions = positions.tolist()
+        at = np.zeros(GRID_CELLS, dtype=np.intp)
+        at[positions] = np.arange(len(positions))
+        # Any monster that lost its cell or now stands next to a freed one chooses again
+        targets[winners] = positions[winners, None]
+        distances = np.where(occupied[targets], UNREACHABLE, field[targets])
+        choosing = np.flatnonzero(distances.min(axis=1) < field[positions])
+        return winners.tolist(), choosing.tolist(), at.tolist()
+
+    def _choosing_again(self, done: set, losers: list, vacated: list, at: list) -> list:
+        """
+        Find the monsters that may choose differently in the next round of move_monsters: any
+        other monster that has not moved saw no better free cell, and the only new free cells
+        are the ones just freed.
+
+        Parameters:
+            done (set): Indexes of the monsters that moved so far.
+            losers (list): Indexes of the monsters that lost the cell they chose this round.
+            vacated (list): Positions the monsters that moved this round left.
+            at (list): Grid position -> index of the monster standing there, read only where one stands.
+
+        Returns:
+            list: Indexes of the monsters that lost a cell, or that have not moved yet and stand
+            next to a freed cell closer to the head than their own, in increasing order.
+        """
+        field, occupied = self.field, self.monster_cells
+        choosing = set(losers)
+        for cell in vacated:
+            distance = field[cell]
+            for position in (cell + 1, cell - 1, cell + STRIDE, cell - STRIDE):
+                if occupied[position] and distance < field[position] and at[position] not in done:
+                    choosing.add(at[position])
+        return sorted(choosing)
+
+    def _tick_food(self) -> None:
+        waiting = [index for index, eaten in enumerate(self.eaten) if not eaten]
+        index = self.rng.choice(waiting)
+        d_col, d_row = self.rng.choice(((0, 2), (0, -2), (2, 0), (-2, 0)))
+        cell = (self.food[index][0] + d_col, self.food[index][1] + d_row)
+        # Food never lands on other food, so every cell holds at most one item
+        if in_bounds(cell) and not self.food_cells[cell_index(cell)]:
+            self.food_cells[cell_index(self.food[index])] = 0
+            self.food_cells[cell_index(cell)] = index + 1
+            self.food[index] = cell
+        self.events.append(("food_moved", index))
+        self.timers["food"] = self.time + self.rng.randint(*FOOD_MOVE_TIME)
+
+    def _tick_contact(self) -> None:
+        if self.check_contact():
+            self.contacts += 1
+            self.events.append(("contact",))
+        self.timers["contact"] = self.time + CONTACT_INTERVAL
+
+    def check_contact(self) -> bool:
+        """
+        Returns:
+            bool: True if a monster is on a cell of the snake's body.
+        """
+        # Look up whichever side is smaller in the other's grid
+        if len(self.positions) <= len(self.body):
+            body_cells = self.body_cells
+            return any(body_cells[position] for position in self.positions)
+        monster_cells = self.monster_cells
+        return any(monster_cells[cell_index(cell)] for cell in self.body)
+
+
+def random_inputs(rng: random.Random, chance: float = 0.05) -> list:
+    """
+    Returns:
+        list: The keys a simulated player presses during one tick, usually none.
+    """
+    return [rng.choice(tuple(DIRECTIONS))] if rng.random() < chance else []
+
+
+def benchmark(ticks: int = 200000, seed: int = 1002) -> None:
+    """
+    Play games with random keys back to back and print how many ticks run per second.
+
+    Parameters:
+        ticks (int): Ticks of TICK milliseconds to simulate.
+        seed (int): Seed for the games and the keys.
+    """
+    rng = random.Random(seed)
+    games = outcomes = 0
+    state = GameState(rng.random())
+    started = time.perf_counter()
+    for _ in range(ticks):
+        state.step(TICK, random_inputs(rng))
+        if state.outcome:
+            outcomes += state.outcome == "won"
+            games += 1
+            state = GameState(rng.random())
+    elapsed = time.perf_counter() - started
+    print("{} ticks in {:.2f}s ({:.0f} ticks/sec), {} games finished, {} won".format(
+        ticks, elapsed, ticks / elapsed, games, outcomes))
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)